@@ -2,11 +2,18 @@
 Narrative Journal - Tracks key game events for grounding and UI.
 """
 
-from typing import List, Optional, Any
+from typing import Iterable, List, Optional, Any, Tuple
 
 MAX_ENTRIES = 50
 
 
+def _format_entry(text: str, turn_count: Optional[int]) -> str:
+    """Prefix an entry with its turn number, or [Event] when there is none."""
+    if turn_count is not None:
+        return f"[Turn {turn_count}] {text}"
+    return f"[Event] {text}"
+
+
 class Journal:
     """
     Manages a list of past events (e.g. critical rolls, story triggers).
@@ -20,11 +27,15 @@ class Journal:
         """
         Add a timestamped/turn-based entry. Keeps only the last MAX_ENTRIES.
         """
-        if turn_count is not None:
-            entry = f"[Turn {turn_count}] {text}"
-        else:
-            entry = f"[Event] {text}"
-        self._entries.append(entry)
+        self._entries.append(_format_entry(text, turn_count))
+        if len(self._entries) > MAX_ENTRIES:
+            del self._entries[: len(self._entries) - MAX_ENTRIES]
+
+    def add_entries(self, batch: Iterable[Tuple[str, Optional[int]]]) -> None:
+        """
+        Add several (text, turn_count) entries at once; trims to MAX_ENTRIES once per batch.
+        """
+        self._entries.extend(_format_entry(text, turn_count) for text, turn_count in batch)
         if len(self._entries) > MAX_ENTRIES:
             del self._entries[: len(self._entries) - MAX_ENTRIES]
 
@@ -114,9 +114,12 @@ class GameSession:
             self.ui.print_error(f"Graph Error: {e}")
             return "continue"
 
-        for event in result.get("journal_events", []):
+        journal_events = result.get("journal_events", [])
+        for event in journal_events:
             self.ui.print_system_info(f"🎲 {event}")
-            self.journal.add_entry(event, len(self.conversation_history) // 2)
+        if journal_events:
+            turn_count = len(self.conversation_history) // 2
+            self.journal.add_entries((event, turn_count) for event in journal_events)
 
         if result.get("thought_process"):
             self.ui.print_inner_thought(result["thought_process"])
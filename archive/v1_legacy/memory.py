@@ -3,6 +3,31 @@ import json
 from typing import Dict, Any, Optional
 from config import settings
 
+try:  # optional: C 实现的 JSON 编码器，存档变大时明显快于标准库
+    import orjson
+except ModuleNotFoundError:  # pragma: no cover - orjson 不是必需依赖
+    orjson = None
+
+
+def _dumps(data: Dict[str, Any]) -> bytes:
+    """序列化存档为 UTF-8 JSON（缩进 2、保留非 ASCII）；orjson 无法编码时退回标准库。"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass
+    return json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+
+
+def _loads(raw: bytes) -> Any:
+    """解析存档字节；orjson 不接受的输入（如带 BOM）交给标准库。"""
+    if orjson is not None:
+        try:
+            return orjson.loads(raw)
+        except ValueError:
+            pass
+    return json.loads(raw)
+
 
 class MemoryManager:
     """
@@ -30,38 +55,43 @@ class MemoryManager:
             return default_state
 
         try:
-            with open(self.filepath, 'r', encoding='utf-8') as f:
-                content = f.read().strip()
-                if not content:
-                    return default_state
-
-                data = json.loads(content)
-
-                if isinstance(data, list):
-                    default_state["history"] = data
-                    return default_state
-
-                if isinstance(data, dict):
-                    for key, default_val in default_state.items():
-                        if key not in data:
-                            data[key] = default_val
+            # 直接解析读入的字节，不再 decode + strip 复制出第二份存档文本
+            with open(self.filepath, 'rb') as f:
+                raw = f.read()
+            if not raw or raw.isspace():
+                return default_state
 
-                    if data.get("relationship_score") is None:
-                        data["relationship_score"] = default_relationship
+            data = _loads(raw)
 
-                    return data
+            # 当前存档格式（dict）最常见，放在前面；缺失字段一次性合并补齐
+            if type(data) is dict:
+                data = {**default_state, **data}
+                if data["relationship_score"] is None:
+                    data["relationship_score"] = default_relationship
+                return data
 
+            # 向后兼容：早期存档只保存了对话历史列表
+            if type(data) is list:
+                default_state["history"] = data
                 return default_state
 
+            return default_state
+
         except Exception as e:
             print(f"[Memory Error] Failed to load {self.filepath}: {e}")
             return default_state
 
     def save(self, data: Dict[str, Any]) -> bool:
+        # 先写临时文件再原子替换，写到一半崩溃也不会损坏旧存档
+        tmp_path = self.filepath + ".tmp"
         try:
-            with open(self.filepath, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            payload = _dumps(data)
+            with open(tmp_path, 'wb') as f:
+                f.write(payload)
+            os.replace(tmp_path, self.filepath)
             return True
         except Exception as e:
             print(f"[Memory Error] Failed to save to {self.filepath}: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
             return False
@@ -3,7 +3,6 @@ Character Loader Module
 Loads character data from YAML files and Jinja2 templates.
 """
 
-import copy
 import os
 import re
 import yaml
@@ -169,9 +168,12 @@ def _ensure_dialogue_style(attrs: Dict[str, Any]) -> None:
 
 def normalize_character_attributes_for_template(raw: Dict[str, Any]) -> Dict[str, Any]:
     """
-    深拷贝 YAML 数据并补全 persona_template.j2 强依赖字段，避免简版角色卡渲染崩溃。
+    浅拷贝 YAML 数据并补全 persona_template.j2 强依赖字段，避免简版角色卡渲染崩溃。
+
+    补全只替换顶层键（ability_scores / dialogue_style 均新建 dict），嵌套结构与原数据共享，
+    调用方不得原地修改嵌套值；每轮渲染因此不再深拷贝整张角色卡。
     """
-    out = copy.deepcopy(raw)
+    out = dict(raw)
     _ensure_ability_scores(out)
     _ensure_dialogue_style(out)
     out.setdefault("race", "")
@@ -354,9 +354,9 @@ def filter_environment_objects_for_actor(
 
 
 def build_visible_history(messages: List[Any], actor_id: str, limit: int = 12) -> List[VisibleMessage]:
-    bounded = list(messages or [])
-    if limit > 0:
-        bounded = bounded[-limit:]
+    # 先切片再拷贝：长会话只触碰窗口内的消息，prefill 与转换开销不随会话长度增长
+    raw_messages = messages or []
+    bounded = list(raw_messages[-limit:] if limit > 0 else raw_messages)
 
     normalized: List[VisibleMessage] = []
     for raw_message in bounded:
@@ -1,13 +1,31 @@
 """
 V2 兼容层：Generation 节点仍依赖 engine 的 generate_dialogue / parse_ai_response。
 引擎实现已归档至 archive/v1_legacy/engine.py，此处仅作 re-export。
+
+导出按需加载：归档引擎在导入时就会 import openai 并创建客户端，而
+core.engine.physics 等子模块（骰子、机制层都会用到）并不需要它。
 """
 
-from archive.v1_legacy.engine import (
-    generate_dialogue,
-    parse_ai_response,
-    update_summary,
-)
-from core.engine.physics import apply_physics
+from importlib import import_module
+
+_EXPORTS = {
+    "generate_dialogue": ("archive.v1_legacy.engine", "generate_dialogue"),
+    "parse_ai_response": ("archive.v1_legacy.engine", "parse_ai_response"),
+    "update_summary": ("archive.v1_legacy.engine", "update_summary"),
+    "apply_physics": ("core.engine.physics", "apply_physics"),
+}
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module_name, attr_name = _EXPORTS[name]
+    module = import_module(module_name)
+    return getattr(module, attr_name)
 
-__all__ = ["generate_dialogue", "parse_ai_response", "update_summary", "apply_physics"]
+__all__ = [
+    "generate_dialogue",
+    "parse_ai_response",
+    "update_summary",
+    "apply_physics",
+]
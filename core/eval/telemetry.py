@@ -47,10 +47,6 @@ def _as_float(value: Any) -> float:
         return 0.0
 
 
-def _coerce_dict(value: Any) -> Dict[str, Any]:
-    return dict(value) if isinstance(value, Mapping) else {}
-
-
 def _safe_get(obj: Any, key: str, default: Any = None) -> Any:
     if isinstance(obj, Mapping):
         return obj.get(key, default)
@@ -84,15 +80,28 @@ def extract_token_usage(payload: Any) -> Dict[str, int]:
 
     # OpenAI style: response.usage.{prompt_tokens, completion_tokens, total_tokens}
     usage_obj = _safe_get(payload, "usage")
-    if usage_obj is not None:
-        usage_dict = _coerce_dict(usage_obj)
-        if usage_dict or any(hasattr(usage_obj, name) for name in ("prompt_tokens", "completion_tokens", "total_tokens")):
-            usage_dict = usage_dict or {
-                "prompt_tokens": _safe_get(usage_obj, "prompt_tokens", 0),
-                "completion_tokens": _safe_get(usage_obj, "completion_tokens", 0),
-                "total_tokens": _safe_get(usage_obj, "total_tokens", 0),
-            }
-            return normalize_token_usage(usage_dict)
+    if isinstance(usage_obj, Mapping):
+        if usage_obj:
+            return normalize_token_usage(dict(usage_obj))
+    elif usage_obj is not None:
+        try:
+            # Happy path: SDK usage objects carry all three counters
+            return normalize_token_usage(
+                {
+                    "prompt_tokens": usage_obj.prompt_tokens,
+                    "completion_tokens": usage_obj.completion_tokens,
+                    "total_tokens": usage_obj.total_tokens,
+                }
+            )
+        except AttributeError:
+            if any(hasattr(usage_obj, name) for name in ("prompt_tokens", "completion_tokens", "total_tokens")):
+                return normalize_token_usage(
+                    {
+                        "prompt_tokens": getattr(usage_obj, "prompt_tokens", 0),
+                        "completion_tokens": getattr(usage_obj, "completion_tokens", 0),
+                        "total_tokens": getattr(usage_obj, "total_tokens", 0),
+                    }
+                )
 
     # LangChain style: AIMessage.usage_metadata
     usage_metadata = _safe_get(payload, "usage_metadata")
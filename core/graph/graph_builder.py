@@ -7,6 +7,8 @@ Checkpointer 由调用方（如 main.py）创建并传入，支持 AsyncSqliteSa
 from langgraph.graph import END, START, StateGraph
 
 from core.graph.graph_routers import (
+    INTENT_SYSTEM_WAIT,
+    SYSTEM_COMMAND_INTENTS,
     route_after_actor_invocation,
     route_after_dm,
     route_after_mechanics,
@@ -26,14 +28,14 @@ from core.graph.nodes.mechanics import mechanics_node
 def route_after_input(state: dict) -> str:
     """拦截开发者指令与纯系统指令（不进入 world_tick / DM，不唤醒 LLM）"""
     intent = state.get("intent", "")
-    if intent in ("dev_command", "command_failed", "command_done"):
+    if intent in SYSTEM_COMMAND_INTENTS:
         return "__end__"
     return "world_tick"
 
 
 def route_after_tick(state: dict) -> str:
     """只短路 system_wait；聊天和 action_use 进入 DM 判定和大模型反应"""
-    if state.get("intent") == "system_wait":
+    if state.get("intent") == INTENT_SYSTEM_WAIT:
         return "__end__"
     return "dm_analysis"
 
@@ -6,6 +6,7 @@ LangGraph 路由逻辑：根据 State 中的 intent 决定下一跳节点。
 """
 
 import random
+import sys
 from typing import Any, Dict, Literal, cast
 from core.graph.graph_state import GameState
 
@@ -22,6 +23,27 @@ _VALID_ACTOR_INVOCATION_ROUTES: frozenset[str] = frozenset(
     {"event_drain", "generation", "__end__"}
 )
 
+# 系统级 intent
+INTENT_CHAT = "chat"
+INTENT_PENDING = "pending"
+INTENT_COMMAND_DONE = "command_done"
+INTENT_COMMAND_FAILED = "command_failed"
+INTENT_DEV_COMMAND = "dev_command"
+INTENT_GIFT_GIVEN = "gift_given"
+INTENT_ITEM_USED = "item_used"
+INTENT_SYSTEM_WAIT = "system_wait"
+
+# 纯系统指令：input 之后直接 __end__，不进入 world_tick / DM
+SYSTEM_COMMAND_INTENTS: frozenset[str] = frozenset(
+    {INTENT_DEV_COMMAND, INTENT_COMMAND_FAILED, INTENT_COMMAND_DONE}
+)
+# 已就地处理的指令（含旧存档中的 gift_given / item_used），DM 不再调用 LLM
+DM_SKIP_INTENTS: frozenset[str] = frozenset({INTENT_COMMAND_DONE, INTENT_GIFT_GIVEN, INTENT_ITEM_USED})
+# 非检定意图：Mechanics 节点直接跳过（刺探秘密除外）
+MECHANICS_SKIP_INTENTS: frozenset[str] = frozenset(
+    {INTENT_CHAT, "CHAT", INTENT_PENDING, *DM_SKIP_INTENTS}
+)
+
 # PERSUASION/DECEPTION/STEALTH 必须在到达 generation 前经过 mechanics_processing 执行检定
 MECHANICS_REQUIRED_INTENTS: tuple[str, ...] = ("PERSUASION", "DECEPTION", "STEALTH")
 
@@ -56,7 +78,8 @@ ACTION_INTENTS: tuple[str, ...] = (
     "ACTION",
     "READ",
 )
-assert set(MECHANICS_REQUIRED_INTENTS).issubset(set(ACTION_INTENTS)), (
+_ACTION_INTENT_SET: frozenset[str] = frozenset(ACTION_INTENTS)
+assert _ACTION_INTENT_SET.issuperset(MECHANICS_REQUIRED_INTENTS), (
     "MECHANICS_REQUIRED_INTENTS must be subset of ACTION_INTENTS"
 )
 
@@ -109,8 +132,8 @@ def route_after_input(state: GameState) -> INPUT_ROUTE:
     纯系统指令（含 /give、/use 成功）使用 intent=command_done，直接 __end__，不进入 DM。
     其余意图进入 dm_analysis（实际主程序在 graph_builder 中先经 world_tick 再到 dm_analysis）。
     """
-    intent = state.get("intent", "pending")
-    if intent == "command_done":
+    intent = state.get("intent", INTENT_PENDING)
+    if intent == INTENT_COMMAND_DONE:
         return _validate_input_route("__end__")
     return _validate_input_route("dm_analysis")
 
@@ -146,7 +169,7 @@ def route_after_dm(state: GameState) -> DM_ROUTE:
         return _validate_dm_route("lore_processing")
     if is_probing_secret:
         return _validate_dm_route("mechanics_processing")
-    if intent in ACTION_INTENTS:
+    if intent in _ACTION_INTENT_SET:
         return _validate_dm_route("mechanics_processing")
     return _validate_dm_route("generation")
 
@@ -175,6 +198,12 @@ ENVIRONMENTAL_SKILLS = frozenset({
     "sleight_of_hand", "survival", "nature", "medicine", "history", "religion", "arcana",
 })
 
+# 战斗与物理动作 (交给 DM 旁白节点)
+NARRATION_ACTION_INTENTS = frozenset({
+    "attack", "cast_spell", "loot", "use_item", "consume", "equip", "unequip",
+    "move", "approach", "trigger_trap", "interact", "disarm", "unlock", "end_turn",
+})
+
 MECHANICS_ROUTE = Literal["generation", "narration"]
 
 
@@ -201,22 +230,7 @@ def route_after_mechanics(state: GameState) -> MECHANICS_ROUTE:
         return "narration"
 
     # 战斗等 → DM 旁白
-    if intent in (
-        "attack",
-        "cast_spell",
-        "loot",
-        "use_item",
-        "consume",
-        "equip",
-        "unequip",
-        "move",
-        "approach",
-        "trigger_trap",
-        "interact",
-        "disarm",
-        "unlock",
-        "end_turn",
-    ):
+    if intent in NARRATION_ACTION_INTENTS:
         return "narration"
 
     # 默认兜底交还给 NPC
@@ -271,4 +285,16 @@ __all__ = [
     "MECHANICS_REQUIRED_INTENTS",
     "SOCIAL_INTENTS",
     "ENVIRONMENTAL_SKILLS",
+    "NARRATION_ACTION_INTENTS",
+    "SYSTEM_COMMAND_INTENTS",
+    "DM_SKIP_INTENTS",
+    "MECHANICS_SKIP_INTENTS",
+    "INTENT_CHAT",
+    "INTENT_PENDING",
+    "INTENT_COMMAND_DONE",
+    "INTENT_COMMAND_FAILED",
+    "INTENT_DEV_COMMAND",
+    "INTENT_GIFT_GIVEN",
+    "INTENT_ITEM_USED",
+    "INTENT_SYSTEM_WAIT",
 ]
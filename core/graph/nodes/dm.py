@@ -30,6 +30,7 @@ from core.campaigns import (
     detect_trap_awareness_context,
 )
 from core.engine import generate_dialogue, parse_ai_response
+from core.graph.graph_routers import DM_SKIP_INTENTS
 from core.graph.graph_state import GameState
 from core.graph.nodes.utils import _build_item_lore, default_entities, entity_display_name, first_entity_id
 from core.llm.dm import analyze_intent
@@ -998,7 +999,7 @@ async def dm_node(state: GameState) -> dict:
     兼容旧存档中偶发的 gift_given / item_used。
     DM 派发多人发言队列，并结算好感度变化，渲染 BG3 风格提示。
     """
-    if state.get("intent") in ("command_done", "gift_given", "item_used"):
+    if state.get("intent") in DM_SKIP_INTENTS:
         return {}
 
     idle_intent = str(state.get("intent") or "").strip().lower()
@@ -17,6 +17,7 @@ import logging
 import os
 import time
 from collections.abc import Coroutine
+from functools import lru_cache
 from typing import Any, Callable, Dict, List, Optional
 
 from jinja2 import Environment, FileSystemLoader
@@ -34,6 +35,7 @@ from core.engine.physics import (
     execute_loot,
 )
 from core.eval.telemetry import emit_telemetry, extract_token_usage
+from core.eval.token_estimator import estimate_text_tokens
 from core.graph.graph_state import GameState
 from core.graph.nodes.utils import (
     _message_to_dict,
@@ -52,10 +54,14 @@ from core.utils.text_processor import clean_npc_dialogue, format_history_message
 # 全局开关：设为 True 时打印发给大模型的 Payload（调试用）
 DEBUG_AI_PAYLOAD = False
 LLM_TIMEOUT_SECONDS = 4.5
+# 发给模型的历史窗口：最多保留的条数与估算 token 上限
+HISTORY_MAX_MESSAGES = 20
+HISTORY_TOKEN_BUDGET = 3000
 logger = logging.getLogger(__name__)
 
 
 _CONSUME_ACTION_INTENTS = {"use_item", "consume"}
+_BANTER_ALLOWED_INTENTS = frozenset({"chat", "banter", "trigger_idle_banter"})
 
 
 def _is_generation_speaker_candidate(entity_id: str) -> bool:
@@ -367,20 +373,21 @@ def _build_actor_visible_item_lore(actor_view: ActorView) -> str:
     if not known_items:
         return ""
 
-    item_lore = (
+    lore_lines = [
         "\n\n[CRITICAL KNOWLEDGE: ITEM DATABASE]\n"
         "Here is the real data for the items currently in the game. "
         "Use their translated names and respect their effects/descriptions:\n"
-    )
+    ]
     for item_id in sorted(known_items):
         data = registry.get(item_id)
-        item_lore += (
+        lore_lines.append(
             f"- ID: {item_id} | Name: {data.get('name')} | "
             f"Desc: {data.get('description')} | Effect: {data.get('effect', 'None')}\n"
         )
-    return item_lore
+    return "".join(lore_lines)
 
 
+@lru_cache(maxsize=1)
 def _prompt_environment() -> Environment:
     prompts_dir = os.path.join(
         os.path.dirname(os.path.abspath(__file__)), "..", "..", "llm", "prompts"
@@ -392,6 +399,12 @@ def _prompt_environment() -> Environment:
     )
 
 
+@lru_cache(maxsize=1)
+def _system_rules_prompt() -> str:
+    """system_rules.j2 不含变量，渲染结果整个进程复用，不必每轮重新解析模板。"""
+    return _prompt_environment().get_template("system_rules.j2").render()
+
+
 def _debug_print_messages(messages: List[BaseMessage], label: str = "") -> None:
     if not DEBUG_AI_PAYLOAD:
         return
@@ -640,6 +653,30 @@ def _build_a_to_a_suffix(last_speaker_id: str, last_speaker_text: str) -> str:
     )
 
 
+@lru_cache(maxsize=1024)
+def _message_token_count(content: str) -> int:
+    """按内容缓存单条消息的 token 估算；历史消息逐轮重复出现，不必每轮重算。"""
+    return estimate_text_tokens(content)
+
+
+def _trim_history_by_tokens(
+    messages: List[Dict[str, str]],
+    *,
+    max_messages: int = HISTORY_MAX_MESSAGES,
+    token_budget: int = HISTORY_TOKEN_BUDGET,
+) -> List[Dict[str, str]]:
+    """从最新一条往回保留历史，条数或 token 预算先用尽即停；最新一条总会保留。"""
+    kept = 0
+    used_tokens = 0
+    for message in reversed(messages[-max_messages:]):
+        tokens = _message_token_count(str(message.get("content") or ""))
+        if kept and used_tokens + tokens > token_budget:
+            break
+        used_tokens += tokens
+        kept += 1
+    return messages[len(messages) - kept:]
+
+
 def _format_history_messages(
     actor_view: ActorView,
     context: Dict[str, Any],
@@ -657,7 +694,7 @@ def _format_history_messages(
         if not messages or str(messages[-1].get("content") or "") != user_input:
             messages.append({"role": "user", "content": user_input})
 
-    recent_messages = messages[-20:] if len(messages) > 20 else messages
+    recent_messages = _trim_history_by_tokens(messages)
     history_dicts = [_message_to_dict(message) for message in recent_messages]
 
     prompt_suffix = _build_physical_action_suffix(
@@ -711,12 +748,19 @@ def _prepare_generation_context(
     inventory_state = _extract_inventory_states(state, current_npc)
     npc_inv = inventory_state["npc_inv"]
     player_inv = inventory_state["player_inv"]
-    journal_events = list(actor_view.recent_public_events)
-    summary = state.get("summary", "Graph Mode Testing")
-    prev_responses = list(state.get("speaker_responses", []))
-    is_first_npc_of_player_turn = len(prev_responses) == 0
+    # 一次性解出本节点需要的 state 顶层字段，避免在下文反复 state.get
+    summary, raw_responses, state_location, raw_intent = (
+        state.get("summary", "Graph Mode Testing"),
+        state.get("speaker_responses") or [],
+        state.get("current_location", "Unknown Location"),
+        state.get("intent", "chat"),
+    )
+    # recent_public_events 已是 ActorView 自有列表，下游只切片读取，无需再拷贝
+    journal_events = actor_view.recent_public_events
+    prev_responses = list(raw_responses)
+    is_first_npc_of_player_turn = not prev_responses
     environmental_awareness = {
-        "current_location": actor_view.current_location or state.get("current_location", "Unknown Location"),
+        "current_location": actor_view.current_location or state_location,
         "current_env_objs": {
             env_id: dict(env_data)
             for env_id, env_data in (actor_view.visible_environment_objects or {}).items()
@@ -724,12 +768,11 @@ def _prepare_generation_context(
         },
     }
 
-    intent = str(state.get("intent", "chat") or "chat").strip().lower()
+    intent = str(raw_intent or "chat").strip().lower()
     idle_banter = intent == "trigger_idle_banter"
     latest_roll = actor_view.latest_roll
-    banter_allowed_intents = frozenset({"chat", "banter", "trigger_idle_banter"})
     needs_full_agent = (
-        intent not in banter_allowed_intents
+        intent not in _BANTER_ALLOWED_INTENTS
         or _latest_roll_is_meaningful(latest_roll)
         or bool(actor_view.is_probing_secret)
         or _player_message_suggests_item_offer(user_input)
@@ -885,10 +928,11 @@ def _build_system_prompt(actor_view: ActorView, context: Dict[str, Any]) -> str:
     speaker = context["speaker"]
     character = context["character"]
     idle_banter = context["idle_banter"]
+    parts: List[str] = []
     if idle_banter:
         location = context["environment"]["current_location"]
         party_ids = ", ".join(sorted(context["entities"].keys()))
-        system_prompt = (
+        parts.append(
             "[SYSTEM NOTE - IDLE BANTER MODE]: The player is AFK. You are no longer playing a single character, "
             "but acting as the Omni-Director of the game engine. Your task is to generate a spontaneous ambient "
             "interaction between the NPCs present in the current_location.\n\n"
@@ -904,7 +948,7 @@ def _build_system_prompt(actor_view: ActorView, context: Dict[str, Any]) -> str:
         )
     else:
         current_npc_data = context["current_npc_data"]
-        system_prompt = character.render_prompt(
+        parts.append(character.render_prompt(
             relationship_score=context["affection"],
             affection=context["affection"],
             flags=context["flags"],
@@ -917,25 +961,22 @@ def _build_system_prompt(actor_view: ActorView, context: Dict[str, Any]) -> str:
             active_buffs=current_npc_data.get("active_buffs", []),
             shar_faith=current_npc_data.get("shar_faith"),
             memory_awakening=current_npc_data.get("memory_awakening"),
-        )
-        item_lore = _build_actor_visible_item_lore(actor_view)
-        if item_lore:
-            system_prompt += item_lore
-        system_prompt += f"Current Speaker: {speaker}\n"
+        ))
+        parts.append(_build_actor_visible_item_lore(actor_view))
+        parts.append(f"Current Speaker: {speaker}\n")
 
-    system_prompt += f"Player's Current Inventory: {context['player_inv']}\n"
+    parts.append(f"Player's Current Inventory: {context['player_inv']}\n")
     roll_for_prompt = None if idle_banter else context["latest_roll"]
-    system_prompt += _build_dynamic_context_prompt(actor_view, roll_for_prompt)
+    parts.append(_build_dynamic_context_prompt(actor_view, roll_for_prompt))
 
     if not idle_banter and len(context["prev_responses"]) > 0:
         last_speaker_id, last_speaker_text = context["prev_responses"][-1]
-        system_prompt += _build_a_to_a_suffix(last_speaker_id, last_speaker_text)
+        parts.append(_build_a_to_a_suffix(last_speaker_id, last_speaker_text))
 
-    rules_tpl = _prompt_environment().get_template("system_rules.j2")
-    system_prompt += "\n" + rules_tpl.render() + "\n"
+    parts.extend(("\n", _system_rules_prompt(), "\n"))
 
     if idle_banter:
-        system_prompt += (
+        parts.append(
             "\n[OVERRIDE]: For this request only, ignore any single-NPC roleplay or solo `reply` schema "
             "in the rules above. You are the Omni-Director; output only one JSON object with the `responses` array.\n"
             "\nOutput ONLY valid JSON (no markdown fences) with this exact shape:\n"
@@ -944,7 +985,8 @@ def _build_system_prompt(actor_view: ActorView, context: Dict[str, Any]) -> str:
             "Do NOT address the player or ask for their input.\n"
         )
 
-    return system_prompt
+    # 各段先收集再一次性拼接，避免逐段 += 反复复制整段提示词
+    return "".join(parts)
 
 
 def _build_lc_messages(system_prompt: str, history_dicts: List[Dict[str, str]]) -> List[BaseMessage]:
@@ -958,10 +1000,27 @@ def _build_lc_messages(system_prompt: str, history_dicts: List[Dict[str, str]])
 
 
 def _create_llm_client(idle_banter: bool) -> Any:
-    llm = ChatOpenAI(
-        model=settings.MODEL_NAME,
-        api_key=settings.API_KEY,  # type: ignore[arg-type]
-        base_url=settings.BASE_URL,
+    return _cached_llm_client(
+        ChatOpenAI, settings.MODEL_NAME, settings.API_KEY, settings.BASE_URL, idle_banter
+    )
+
+
+@lru_cache(maxsize=4)
+def _cached_llm_client(
+    factory: Callable[..., Any],
+    model: str,
+    api_key: Optional[str],
+    base_url: Optional[str],
+    idle_banter: bool,
+) -> Any:
+    """
+    同一配置只构造一次 ChatOpenAI（及绑定工具后的版本），各轮复用其 HTTP 连接池。
+    factory 参与缓存键，评测回放 patch 掉 ChatOpenAI 后会拿到新的实例。
+    """
+    llm = factory(
+        model=model,
+        api_key=api_key,  # type: ignore[arg-type]
+        base_url=base_url,
         temperature=0.7,
         max_completion_tokens=500,
     )
@@ -15,6 +15,9 @@ from core.graph.nodes.utils import _entity_snapshot, default_entities, first_ent
 from core.systems import mechanics
 from core.systems.inventory import get_registry
 
+# ItemRegistry 为进程级单例（数据按需懒加载），模块导入时绑定一次即可
+_ITEM_REGISTRY = get_registry()
+_CORE_PARTY_IDS = ("player", "shadowheart", "astarion", "laezel")
 _ACT3_SIDE_MARKERS = (
     "阿斯代伦说得对",
     "顺着阿斯代伦",
@@ -299,7 +302,7 @@ def input_node(state: GameState) -> dict:
     else:
         entities = copy.deepcopy(raw_entities)
     # 热更新：仅补齐核心队伍角色，避免将默认敌对单位注入到非目标地图会话。
-    for npc_id in ("player", "shadowheart", "astarion", "laezel"):
+    for npc_id in _CORE_PARTY_IDS:
         if npc_id in entities or npc_id not in default_entities:
             continue
         entities[npc_id] = copy.deepcopy(default_entities[npc_id])
@@ -307,8 +310,11 @@ def input_node(state: GameState) -> dict:
     incoming_intent_key = incoming_intent.lower()
     incoming_target = str(state.get("target") or "").strip()
     incoming_source = str(state.get("source") or "").strip().lower()
-    raw_intent_context = state.get("intent_context") if isinstance(state.get("intent_context"), dict) else {}
-    intent_context = copy.deepcopy(raw_intent_context)
+    # 绝大多数回合 intent_context 为空：跳过 deepcopy，直接给一个新 dict
+    raw_intent_context = state.get("intent_context")
+    intent_context = (
+        copy.deepcopy(raw_intent_context) if isinstance(raw_intent_context, dict) and raw_intent_context else {}
+    )
     if incoming_target:
         intent_context["action_target"] = incoming_target.lower()
     if incoming_source:
@@ -679,7 +685,7 @@ def input_node(state: GameState) -> dict:
                 "is_probing_secret": False,
             }
 
-        item_data = get_registry().get(item_id)
+        item_data = _ITEM_REGISTRY.get(item_id)
         effect = mechanics.apply_item_effect(item_id, item_data)
         focus_speaker = (state.get("current_speaker") or "").strip() or first_entity_id(entities)
         return {
@@ -24,6 +24,7 @@ else:
 
 logger = logging.getLogger(__name__)
 LLM_TIMEOUT_SECONDS = 4.5
+_client: Optional[OpenAI] = None
 
 _LORE_CACHE: Dict[str, Dict[str, Any]] = {}
 DIARY_LORE_IDS = frozenset({"necromancer_diary_1"})
@@ -531,6 +532,14 @@ def _build_dynamic_read_prompt(
     )
 
 
+def _get_openai_client() -> OpenAI:
+    """Return a cached OpenAI client so narration calls reuse one connection pool."""
+    global _client
+    if _client is None:
+        _client = OpenAI(api_key=settings.API_KEY, base_url=settings.BASE_URL)
+    return _client
+
+
 def _generate_read_payload(
     *,
     actor_name: str,
@@ -557,7 +566,7 @@ def _generate_read_payload(
     )
 
     try:
-        client = OpenAI(api_key=settings.API_KEY, base_url=settings.BASE_URL)
+        client = _get_openai_client()
         completion = client.chat.completions.create(
             model=settings.MODEL_NAME,
             messages=[{"role": "user", "content": prompt}],
@@ -2,6 +2,7 @@
 Mechanics 节点：技能检定与掷骰。
 """
 
+from core.graph.graph_routers import INTENT_CHAT, MECHANICS_SKIP_INTENTS
 from core.graph.graph_state import GameState
 from core.systems import mechanics
 
@@ -13,9 +14,9 @@ def mechanics_node(state: GameState) -> dict:
     调用 mechanics.execute_skill_check：仅合并 journal_events 与 latest_roll；
     不修改 entities / affection（情感由 DM 与 LLM 决定）。
     """
-    intent = state.get("intent", "chat")
+    intent = state.get("intent", INTENT_CHAT)
     is_probing_secret = state.get("is_probing_secret", False)
-    if intent in ["chat", "CHAT", "command_done", "pending", "gift_given", "item_used"] and not is_probing_secret:
+    if intent in MECHANICS_SKIP_INTENTS and not is_probing_secret:
         return {}
 
     print(f"⚙️ Mechanics Node: Processing {intent} (is_probing_secret={is_probing_secret})...")
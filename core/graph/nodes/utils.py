@@ -413,15 +413,15 @@ def _msg_content(m) -> str:
     return getattr(m, "content", "")
 
 
+# LangChain message.type / dict role → engine role；未知角色一律按 user 处理
+_ROLE_MAP = {"human": "user", "ai": "assistant", "user": "user", "assistant": "assistant"}
+
+
 def _message_to_dict(m) -> dict:
     """转为 engine 格式：{role: 'user'|'assistant', content: str}。"""
     if isinstance(m, dict):
-        role = m.get("role", "user")
-        role = role if role in ("user", "assistant") else "user"
-        return {"role": role, "content": m.get("content", "")}
-    role = getattr(m, "type", "human")
-    role = "user" if role == "human" else "assistant" if role == "ai" else "user"
-    return {"role": role, "content": getattr(m, "content", "")}
+        return {"role": _ROLE_MAP.get(m.get("role", "user"), "user"), "content": m.get("content", "")}
+    return {"role": _ROLE_MAP.get(getattr(m, "type", "human"), "user"), "content": getattr(m, "content", "")}
 
 
 def first_entity_id(entities: Any) -> str:
@@ -6,12 +6,16 @@ Produces short in-character one-liners for highlight combat events.
 from __future__ import annotations
 
 import logging
-from typing import Any, Dict
+from typing import TYPE_CHECKING, Any, Dict, Optional
 
 from config import settings
 
+if TYPE_CHECKING:
+    from openai import OpenAI
+
 logger = logging.getLogger(__name__)
 LLM_TIMEOUT_SECONDS = 4.5
+_client: Optional["OpenAI"] = None
 
 
 _FALLBACK_BARKS: Dict[str, str] = {
@@ -38,6 +42,16 @@ def _fallback_bark(event_type: str) -> str:
     return _FALLBACK_BARKS.get(normalized, "看招")
 
 
+def _get_openai_client() -> "OpenAI":
+    """Return a cached OpenAI client; barks fire in bursts and should share one connection pool."""
+    global _client
+    if _client is None:
+        from openai import OpenAI
+
+        _client = OpenAI(api_key=settings.API_KEY, base_url=settings.BASE_URL)
+    return _client
+
+
 def generate_combat_bark(
     character_name: str,
     event_type: str,
@@ -56,9 +70,7 @@ def generate_combat_bark(
         return _fallback_bark(normalized_event)
 
     try:
-        from openai import OpenAI
-
-        client = OpenAI(api_key=settings.API_KEY, base_url=settings.BASE_URL)
+        client = _get_openai_client()
         system_prompt = (
             f"你正在扮演{character_name}。"
             "请根据发生的战斗事件，用一句话（10个字以内）表达你的临场反应。"
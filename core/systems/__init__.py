@@ -4,6 +4,7 @@ from importlib import import_module
 
 _EXPORTS = {
     "CheckResult": ("core.systems.dice", "CheckResult"),
+    "RollType": ("core.systems.dice", "RollType"),
     "roll_d20": ("core.systems.dice", "roll_d20"),
     "get_check_result_text": ("core.systems.dice", "get_check_result_text"),
     "ItemRegistry": ("core.systems.inventory", "ItemRegistry"),
@@ -17,6 +18,10 @@ _EXPORTS = {
     "init_registry": ("core.systems.inventory", "init_registry"),
     "execute_skill_check": ("core.systems.mechanics", "execute_skill_check"),
     "process_dialogue_triggers": ("core.systems.mechanics", "process_dialogue_triggers"),
+    "SituationalRule": ("core.systems.mechanics", "SituationalRule"),
+    "DialogueTrigger": ("core.systems.mechanics", "DialogueTrigger"),
+    "build_rules": ("core.systems.mechanics", "build_rules"),
+    "build_triggers": ("core.systems.mechanics", "build_triggers"),
     "apply_item_effect": ("core.systems.mechanics", "apply_item_effect"),
     "check_condition": ("core.systems.mechanics", "check_condition"),
     "QuestManager": ("core.systems.quest", "QuestManager"),
@@ -32,6 +37,7 @@ def __getattr__(name):
 
 __all__ = [
     "CheckResult",
+    "RollType",
     "roll_d20",
     "get_check_result_text",
     "ItemRegistry",
@@ -42,6 +48,10 @@ __all__ = [
     "init_registry",
     "execute_skill_check",
     "process_dialogue_triggers",
+    "SituationalRule",
+    "DialogueTrigger",
+    "build_rules",
+    "build_triggers",
     "apply_item_effect",
     "check_condition",
     "QuestManager",
@@ -4,8 +4,9 @@ Handles D20 System dice mechanics for Baldur's Gate 3 RPG Agent
 """
 
 import random
-from enum import Enum
-from typing import Dict, Any
+from enum import Enum, IntEnum
+from types import MappingProxyType
+from typing import Dict, Any, List, Tuple, Union
 
 
 class CheckResult(Enum):
@@ -16,7 +17,100 @@ class CheckResult(Enum):
     CRITICAL_FAILURE = "CRITICAL_FAILURE"
 
 
-def roll_d20(dc: int, modifier: int = 0, roll_type: str = 'normal') -> Dict[str, Any]:
+class RollType(IntEnum):
+    """Roll mode; the int value indexes the _ROLLERS dispatch tuple"""
+    NORMAL = 0
+    ADVANTAGE = 1
+    DISADVANTAGE = 2
+
+
+_ROLL_TYPE_BY_NAME = MappingProxyType({
+    "normal": RollType.NORMAL,
+    "advantage": RollType.ADVANTAGE,
+    "disadvantage": RollType.DISADVANTAGE,
+})
+
+
+def _roll_normal() -> Tuple[List[int], int]:
+    roll = random.randint(1, 20)
+    return [roll], roll
+
+
+def _roll_advantage() -> Tuple[List[int], int]:
+    rolls = [random.randint(1, 20), random.randint(1, 20)]
+    return rolls, max(rolls)  # Take the higher value
+
+
+def _roll_disadvantage() -> Tuple[List[int], int]:
+    rolls = [random.randint(1, 20), random.randint(1, 20)]
+    return rolls, min(rolls)  # Take the lower value
+
+
+def _format_normal(
+    rolls: List[int], raw_roll: int, modifier: int, total: int, dc: int, result_type: CheckResult
+) -> str:
+    return f"🎲 ({raw_roll}) + {modifier:+d} = {total} vs DC {dc} [{result_type.value}]"
+
+
+def _format_advantage(
+    rolls: List[int], raw_roll: int, modifier: int, total: int, dc: int, result_type: CheckResult
+) -> str:
+    return (
+        f"🎲 [ADV] ({rolls[0]}, {rolls[1]}) -> {raw_roll} + {modifier:+d} = {total} "
+        f"vs DC {dc} [{result_type.value}]"
+    )
+
+
+def _format_disadvantage(
+    rolls: List[int], raw_roll: int, modifier: int, total: int, dc: int, result_type: CheckResult
+) -> str:
+    return (
+        f"🎲 [DIS] ({rolls[0]}, {rolls[1]}) -> {raw_roll} + {modifier:+d} = {total} "
+        f"vs DC {dc} [{result_type.value}]"
+    )
+
+
+# 按 RollType 下标分派掷骰策略（返回 (rolls, raw_roll)）与对应的日志格式
+_ROLLERS = (_roll_normal, _roll_advantage, _roll_disadvantage)
+_LOG_FORMATTERS = (_format_normal, _format_advantage, _format_disadvantage)
+_DEV_MODE_TAG = " [DEV MODE] 自动大成功"
+
+
+def _to_roll_type(roll_type: Union[str, RollType]) -> RollType:
+    """RollType 原样返回；字符串按名称（不区分大小写）映射，未知值视为 normal。"""
+    if isinstance(roll_type, RollType):
+        return roll_type
+    return _ROLL_TYPE_BY_NAME.get(roll_type.lower(), RollType.NORMAL)
+
+
+# 天然点数 → 大成功/大失败（其余点数为 None，交给 DC 比较），以及结果 → 是否成功
+_NATURAL_RESULT = (None, CheckResult.CRITICAL_FAILURE) + (None,) * 18 + (CheckResult.CRITICAL_SUCCESS,)
+_DC_RESULT = (CheckResult.FAILURE, CheckResult.SUCCESS)
+_IS_SUCCESS = MappingProxyType({
+    CheckResult.CRITICAL_SUCCESS: True,
+    CheckResult.SUCCESS: True,
+    CheckResult.FAILURE: False,
+    CheckResult.CRITICAL_FAILURE: False,
+})
+
+
+def _judge_roll(raw_roll: int, modifier: int, dc: int) -> Tuple[int, int, bool, CheckResult]:
+    """
+    按 5e 规则判定一次掷骰，返回 (raw_roll, total, is_success, result_type)。
+
+    天然 20/1 无视 DC，其余按 total >= DC；两步都是查表，不走 if/elif 链。
+    """
+    total = raw_roll + modifier
+    result_type = _NATURAL_RESULT[raw_roll] or _DC_RESULT[total >= dc]
+    return raw_roll, total, _IS_SUCCESS[result_type], result_type
+
+
+def roll_d20(
+    dc: int,
+    modifier: int = 0,
+    roll_type: Union[str, RollType] = 'normal',
+    format_log: bool = True,
+) -> Dict[str, Any]:
     """
     Simulates rolling a 20-sided die (D20) with D&D 5e mechanics.
     
@@ -31,7 +125,8 @@ def roll_d20(dc: int, modifier: int = 0, roll_type: str = 'normal') -> Dict[str,
     Args:
         dc: Difficulty Class (target number to beat)
         modifier: Modifier to add to the roll (e.g., ability modifier, proficiency bonus)
-        roll_type: Type of roll - 'normal', 'advantage', or 'disadvantage'
+        roll_type: Type of roll - RollType, or 'normal', 'advantage', 'disadvantage'
+        format_log: Set False to skip building log_str (returned as "") when only the numbers are needed
     
     Returns:
         Dictionary containing:
@@ -45,81 +140,25 @@ def roll_d20(dc: int, modifier: int = 0, roll_type: str = 'normal') -> Dict[str,
     from core.engine.physics import DEBUG_ALWAYS_PASS_CHECKS
 
     # Normalize roll_type
-    roll_type = roll_type.lower()
-    if roll_type not in ['normal', 'advantage', 'disadvantage']:
-        roll_type = 'normal'
+    roll_type = _to_roll_type(roll_type)
 
     if DEBUG_ALWAYS_PASS_CHECKS:
-        if roll_type == 'normal':
-            rolls = [20]
-        else:
-            rolls = [20, 20]
+        rolls = [20] if roll_type == RollType.NORMAL else [20, 20]
         raw_roll = 20
-        total = raw_roll + modifier
-        result_type = CheckResult.CRITICAL_SUCCESS
-        is_success = True
-        dev_tag = " [DEV MODE] 自动大成功"
-        if roll_type == 'normal':
-            log_str = (
-                f"🎲 ({raw_roll}) + {modifier:+d} = {total} vs DC {dc} [{result_type.value}]{dev_tag}"
-            )
-        elif roll_type == 'advantage':
-            log_str = (
-                f"🎲 [ADV] ({rolls[0]}, {rolls[1]}) -> {raw_roll} + {modifier:+d} = {total} vs DC {dc} "
-                f"[{result_type.value}]{dev_tag}"
-            )
-        else:
-            log_str = (
-                f"🎲 [DIS] ({rolls[0]}, {rolls[1]}) -> {raw_roll} + {modifier:+d} = {total} vs DC {dc} "
-                f"[{result_type.value}]{dev_tag}"
-            )
-        return {
-            "total": total,
-            "raw_roll": raw_roll,
-            "rolls": rolls,
-            "is_success": is_success,
-            "result_type": result_type,
-            "log_str": log_str,
-        }
-
-    # Roll the die(s)
-    if roll_type == 'normal':
-        rolls = [random.randint(1, 20)]
-        raw_roll = rolls[0]
-    elif roll_type == 'advantage':
-        rolls = [random.randint(1, 20), random.randint(1, 20)]
-        raw_roll = max(rolls)  # Take the higher value
-    else:  # disadvantage
-        rolls = [random.randint(1, 20), random.randint(1, 20)]
-        raw_roll = min(rolls)  # Take the lower value
-    
-    # Calculate total (for display purposes, even if crit rules override)
-    total = raw_roll + modifier
-    
-    # Determine result based on D&D 5e rules
-    if raw_roll == 20:
-        # Natural 20: Critical Success (automatic success)
-        result_type = CheckResult.CRITICAL_SUCCESS
-        is_success = True
-    elif raw_roll == 1:
-        # Natural 1: Critical Failure (automatic failure)
-        result_type = CheckResult.CRITICAL_FAILURE
-        is_success = False
     else:
-        # Normal roll: compare total to DC
-        is_success = total >= dc
-        if is_success:
-            result_type = CheckResult.SUCCESS
-        else:
-            result_type = CheckResult.FAILURE
+        # Roll the die(s)
+        rolls, raw_roll = _ROLLERS[roll_type]()
+    
+    # Total is kept for display purposes, even if crit rules override
+    _, total, is_success, result_type = _judge_roll(raw_roll, modifier, dc)
     
     # Format log string based on roll type
-    if roll_type == 'normal':
-        log_str = f"🎲 ({raw_roll}) + {modifier:+d} = {total} vs DC {dc} [{result_type.value}]"
-    elif roll_type == 'advantage':
-        log_str = f"🎲 [ADV] ({rolls[0]}, {rolls[1]}) -> {raw_roll} + {modifier:+d} = {total} vs DC {dc} [{result_type.value}]"
-    else:  # disadvantage
-        log_str = f"🎲 [DIS] ({rolls[0]}, {rolls[1]}) -> {raw_roll} + {modifier:+d} = {total} vs DC {dc} [{result_type.value}]"
+    if format_log:
+        log_str = _LOG_FORMATTERS[roll_type](rolls, raw_roll, modifier, total, dc, result_type)
+        if DEBUG_ALWAYS_PASS_CHECKS:
+            log_str += _DEV_MODE_TAG
+    else:
+        log_str = ""
     
     return {
         "total": total,
@@ -131,6 +170,15 @@ def roll_d20(dc: int, modifier: int = 0, roll_type: str = 'normal') -> Dict[str,
     }
 
 
+_RESULT_TEXT = MappingProxyType({
+    CheckResult.CRITICAL_SUCCESS: "Check Result: CRITICAL SUCCESS! The action succeeds brilliantly.",
+    CheckResult.SUCCESS: "Check Result: SUCCESS. The action succeeds.",
+    CheckResult.CRITICAL_FAILURE: "Check Result: CRITICAL FAILURE! The action fails catastrophically.",
+    CheckResult.FAILURE: "Check Result: FAILURE. The action fails.",
+})
+_UNKNOWN_RESULT_TEXT = "Check Result: Unknown result."
+
+
 def get_check_result_text(result_dict: Dict[str, Any]) -> str:
     """
     Generates a narrative description prompt based on the check result.
@@ -142,15 +190,4 @@ def get_check_result_text(result_dict: Dict[str, Any]) -> str:
     Returns:
         str: Narrative description of the check result
     """
-    result_type = result_dict.get("result_type")
-    
-    if result_type == CheckResult.CRITICAL_SUCCESS:
-        return "Check Result: CRITICAL SUCCESS! The action succeeds brilliantly."
-    elif result_type == CheckResult.SUCCESS:
-        return "Check Result: SUCCESS. The action succeeds."
-    elif result_type == CheckResult.CRITICAL_FAILURE:
-        return "Check Result: CRITICAL FAILURE! The action fails catastrophically."
-    elif result_type == CheckResult.FAILURE:
-        return "Check Result: FAILURE. The action fails."
-    else:
-        return "Check Result: Unknown result."
+    return _RESULT_TEXT.get(result_dict.get("result_type"), _UNKNOWN_RESULT_TEXT)
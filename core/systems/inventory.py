@@ -3,194 +3,215 @@ Inventory Management Module (Data-Driven Architecture)
 Handles item storage and management using a registry-based system.
 """
 
+from __future__ import annotations
+
 import os
-from typing import Dict, List, Optional, Any
-import yaml
+import types
+from collections.abc import Mapping
+from typing import Any
 
 
-class ItemRegistry:
-    """
-    Singleton class for managing static item data from YAML configuration.
-    Acts as the "Single Source of Truth" for item definitions.
+# Registry state lives at module level: there is only ever one item database,
+# and global lookups are cheaper than classmethod binding + class-dict access.
+_ITEMS: dict[str, dict[str, Any]] = {}
+_WEAPONS: dict[str, dict[str, Any]] = {}
+_LOADED: bool = False
+
+# Template for unknown items; get_item_data fills in the name (ID as name fallback)
+_FALLBACK_ITEM: dict[str, Any] = {
+    "name": "",
+    "description": "未知物品",
+    "type": "unknown",
+    "stackable": True,
+    "weight": 0.0,
+}
+
+
+def _default_config_path() -> str:
+    return os.path.abspath(
+        os.path.join(os.path.dirname(__file__), "..", "..", "config", "items.yaml")
+    )
+
+
+def _ensure_loaded() -> None:
+    if not _LOADED:
+        load_item_database(_default_config_path())
+
+
+def _normalize_lookup_key(value: Any) -> str:
+    return str(value or "").strip().lower().replace(" ", "_").replace("-", "_")
+
+
+def _parse_yaml(text: str) -> Any:
+    """libyaml C 绑定可用时用 CSafeLoader，否则退回纯 Python 的 SafeLoader。"""
+    import yaml
+
+    return yaml.load(text, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
+
+
+def load_item_database(filepath: str) -> bool:
     """
-    _instance: Optional['ItemRegistry'] = None
-    _items: Dict[str, Dict[str, Any]] = {}
-    _weapons: Dict[str, Dict[str, Any]] = {}
-    _loaded: bool = False
-
-    @classmethod
-    def _default_config_path(cls) -> str:
-        return os.path.abspath(
-            os.path.join(os.path.dirname(__file__), "..", "..", "config", "items.yaml")
-        )
-
-    @classmethod
-    def _ensure_loaded(cls) -> None:
-        if not cls._loaded:
-            cls.load(cls._default_config_path())
-
-    @staticmethod
-    def _normalize_lookup_key(value: Any) -> str:
-        return str(value or "").strip().lower().replace(" ", "_").replace("-", "_")
+    Load item and weapon definitions from YAML files.
     
-    def __new__(cls) -> 'ItemRegistry':
-        if cls._instance is None:
-            cls._instance = super().__new__(cls)
-        return cls._instance
-    
-    @classmethod
-    def load(cls, filepath: str) -> bool:
-        """
-        Load item and weapon definitions from YAML files.
+    Args:
+        filepath: Path to the items.yaml configuration file. The registry also
+            auto-loads weapons.yaml from the same directory when present.
         
-        Args:
-            filepath: Path to the items.yaml configuration file. The registry also
-                auto-loads weapons.yaml from the same directory when present.
-            
-        Returns:
-            bool: True if loaded successfully, False otherwise
-        """
-        try:
-            if not os.path.exists(filepath):
-                print(f"[ItemRegistry] Warning: Item database not found: {filepath}")
-                return False
-            
-            with open(filepath, 'r', encoding='utf-8') as f:
-                data = yaml.safe_load(f)
-            
-            if data and 'items' in data:
-                cls._items = data['items'] or {}
-                cls._weapons = {}
-                weapons_path = os.path.join(os.path.dirname(filepath), "weapons.yaml")
-                if os.path.exists(weapons_path):
-                    with open(weapons_path, 'r', encoding='utf-8') as wf:
-                        weapons_data = yaml.safe_load(wf) or {}
-                    cls._weapons = weapons_data.get("weapons", {}) or {}
-                cls._loaded = True
-                return True
-            else:
-                print("[ItemRegistry] Warning: No 'items' key found in YAML")
-                return False
-                
-        except Exception as e:
-            print(f"[ItemRegistry] Error loading item database: {e}")
+    Returns:
+        bool: True if loaded successfully, False otherwise
+    """
+    global _ITEMS, _WEAPONS, _LOADED
+    try:
+        if not os.path.exists(filepath):
+            print(f"[ItemRegistry] Warning: Item database not found: {filepath}")
             return False
-    
-    @classmethod
-    def get(cls, item_id: str) -> Dict[str, Any]:
-        """
-        Get item configuration by ID.
-        
-        Args:
-            item_id: The unique identifier for the item
-            
-        Returns:
-            Dict containing item data, or fallback data if not found
-        """
-        cls._ensure_loaded()
-        normalized_id = cls.resolve_item_id(item_id) or str(item_id or "").strip().lower()
-        if normalized_id in cls._items:
-            return cls._items[normalized_id]
-        if normalized_id in cls._weapons:
-            return cls._weapons[normalized_id]
         
-        # Fallback data for unknown items
-        return {
-            "name": item_id,  # Use ID as name fallback
-            "description": "未知物品",
-            "type": "unknown",
-            "stackable": True,
-            "weight": 0.0
-        }
-    
-    @classmethod
-    def get_name(cls, item_id: str) -> str:
-        """
-        Get the display name for an item.
+        with open(filepath, 'r', encoding='utf-8') as f:
+            data = _parse_yaml(f.read())
         
-        Args:
-            item_id: The unique identifier for the item
+        if data and 'items' in data:
+            _ITEMS = data['items'] or {}
+            _WEAPONS = {}
+            weapons_path = os.path.join(os.path.dirname(filepath), "weapons.yaml")
+            if os.path.exists(weapons_path):
+                with open(weapons_path, 'r', encoding='utf-8') as wf:
+                    weapons_data = _parse_yaml(wf.read()) or {}
+                _WEAPONS = weapons_data.get("weapons", {}) or {}
+            _LOADED = True
+            return True
+        else:
+            print("[ItemRegistry] Warning: No 'items' key found in YAML")
+            return False
             
-        Returns:
-            str: The item's display name
-        """
-        item_data = cls.get(item_id)
-        return item_data.get("name", item_id)
+    except Exception as e:
+        print(f"[ItemRegistry] Error loading item database: {e}")
+        return False
 
-    @classmethod
-    def get_item_data(cls, item_id: str) -> Dict[str, Any]:
-        """Alias for get(), kept explicit for systems that read item/weapon data."""
-        return cls.get(item_id)
 
-    @classmethod
-    def resolve_item_id(cls, item_ref: Any) -> str:
-        """
-        Resolve a YAML equipment entry or display name to a canonical item id.
-        Supports exact ids, case-insensitive names, normalized English names,
-        and optional aliases from item/weapon config.
-        """
-        cls._ensure_loaded()
-        raw_ref = str(item_ref or "").strip()
-        if not raw_ref:
-            return ""
-        normalized_ref = cls._normalize_lookup_key(raw_ref)
-        all_data = {**cls._items, **cls._weapons}
-        for item_id, item_data in all_data.items():
-            normalized_id = cls._normalize_lookup_key(item_id)
-            normalized_name = cls._normalize_lookup_key(item_data.get("name", ""))
-            if normalized_ref in {normalized_id, normalized_name}:
+def resolve_item_id(item_ref: Any) -> str:
+    """
+    Resolve a YAML equipment entry or display name to a canonical item id.
+    Supports exact ids, case-insensitive names, normalized English names,
+    and optional aliases from item/weapon config.
+    """
+    _ensure_loaded()
+    raw_ref = str(item_ref or "").strip()
+    if not raw_ref:
+        return ""
+    normalized_ref = _normalize_lookup_key(raw_ref)
+    all_data = {**_ITEMS, **_WEAPONS}
+    for item_id, item_data in all_data.items():
+        normalized_id = _normalize_lookup_key(item_id)
+        normalized_name = _normalize_lookup_key(item_data.get("name", ""))
+        if normalized_ref in {normalized_id, normalized_name}:
+            return str(item_id)
+        for alias in item_data.get("aliases", []) or []:
+            if normalized_ref == _normalize_lookup_key(alias):
                 return str(item_id)
-            for alias in item_data.get("aliases", []) or []:
-                if normalized_ref == cls._normalize_lookup_key(alias):
-                    return str(item_id)
-        return normalized_ref
+    return normalized_ref
+
+
+def get_item_data(item_id: str) -> dict[str, Any]:
+    """
+    Unified item/weapon lookup by ID.
     
-    @classmethod
-    def is_stackable(cls, item_id: str) -> bool:
-        """
-        Check if an item is stackable.
+    Args:
+        item_id: The unique identifier for the item
         
-        Args:
-            item_id: The unique identifier for the item
-            
-        Returns:
-            bool: True if stackable, False otherwise
-        """
-        item_data = cls.get(item_id)
-        return item_data.get("stackable", True)
+    Returns:
+        Dict containing item data, or fallback data if not found
+    """
+    _ensure_loaded()
+    # 精确 ID 命中（背包/装备里存的都是规范 ID）时跳过 resolve_item_id 的全表扫描
+    if isinstance(item_id, str):
+        data = _ITEMS.get(item_id)
+        if data is None:
+            data = _WEAPONS.get(item_id)
+        if data is not None:
+            return data
+    normalized_id = resolve_item_id(item_id) or str(item_id or "").strip().lower()
+    if normalized_id in _ITEMS:
+        return _ITEMS[normalized_id]
+    if normalized_id in _WEAPONS:
+        return _WEAPONS[normalized_id]
     
-    @classmethod
-    def get_max_stack(cls, item_id: str) -> int:
-        """
-        Get the maximum stack size for an item.
-        
-        Args:
-            item_id: The unique identifier for the item
-            
-        Returns:
-            int: Maximum stack size (default 99 if not specified)
-        """
-        item_data = cls.get(item_id)
-        if not item_data.get("stackable", True):
-            return 1
-        return item_data.get("max_stack", 99)
+    # Fallback data for unknown items: only the name differs per miss
+    return {**_FALLBACK_ITEM, "name": item_id}
+
+
+def get_item_name(item_id: str) -> str:
+    """
+    Get the display name for an item.
     
-    @classmethod
-    def is_loaded(cls) -> bool:
-        """Check if the registry has been loaded."""
-        return cls._loaded
+    Args:
+        item_id: The unique identifier for the item
+        
+    Returns:
+        str: The item's display name
+    """
+    return get_item_data(item_id).get("name", item_id)
+
+
+def is_item_stackable(item_id: str) -> bool:
+    """Check if an item is stackable."""
+    return get_item_data(item_id).get("stackable", True)
+
+
+def get_item_max_stack(item_id: str) -> int:
+    """
+    Get the maximum stack size for an item.
     
-    @classmethod
-    def all_items(cls) -> Dict[str, Dict[str, Any]]:
-        """Get all registered items and weapons through a unified view."""
-        cls._ensure_loaded()
-        return {**cls._items, **cls._weapons}
+    Returns:
+        int: Maximum stack size (default 99 if not specified)
+    """
+    item_data = get_item_data(item_id)
+    if not item_data.get("stackable", True):
+        return 1
+    return item_data.get("max_stack", 99)
+
 
-    @classmethod
-    def all_weapons(cls) -> Dict[str, Dict[str, Any]]:
-        """Get all registered weapon definitions."""
-        cls._ensure_loaded()
-        return cls._weapons.copy()
+def is_registry_loaded() -> bool:
+    """Check if the registry has been loaded."""
+    return _LOADED
+
+
+def all_items() -> dict[str, dict[str, Any]]:
+    """Get all registered items and weapons through a unified view."""
+    _ensure_loaded()
+    return {**_ITEMS, **_WEAPONS}
+
+
+def all_weapons() -> dict[str, dict[str, Any]]:
+    """Get all registered weapon definitions."""
+    _ensure_loaded()
+    return _WEAPONS.copy()
+
+
+class ItemRegistry:
+    """
+    Backward-compatible facade over the module-level item database.
+    Acts as the "Single Source of Truth" for item definitions; every method
+    forwards to the free functions above, so instances carry no state.
+    """
+    __slots__ = ()
+
+    _instance: ItemRegistry | None = None
+
+    def __new__(cls) -> ItemRegistry:
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    load = staticmethod(load_item_database)
+    get = staticmethod(get_item_data)
+    get_item_data = staticmethod(get_item_data)
+    get_name = staticmethod(get_item_name)
+    resolve_item_id = staticmethod(resolve_item_id)
+    is_stackable = staticmethod(is_item_stackable)
+    get_max_stack = staticmethod(get_item_max_stack)
+    is_loaded = staticmethod(is_registry_loaded)
+    all_items = staticmethod(all_items)
+    all_weapons = staticmethod(all_weapons)
 
 
 # Global registry instance
@@ -202,12 +223,13 @@ def get_registry() -> ItemRegistry:
     return _registry
 
 
-def get_item_data(item_id: str) -> Dict[str, Any]:
-    """Unified item/weapon lookup convenience function."""
-    return _registry.get_item_data(item_id)
+def _format_stack(item_id: str, qty: int) -> str:
+    """显示名，数量大于 1 时追加 " xN"。"""
+    name = get_item_name(item_id)
+    return f"{name} x{qty}" if qty > 1 else name
 
 
-def format_inventory_dict_to_display_list(inv_dict: Dict[str, int]) -> List[str]:
+def format_inventory_dict_to_display_list(inv_dict: dict[str, int]) -> list[str]:
     """
     将状态中的背包字典（item_id -> 数量）转为易读的显示名列表，供提示词/UI 使用。
     与 Inventory.list_item_names() 逻辑一致，但直接接受 dict，无需实例化 Inventory。
@@ -220,15 +242,7 @@ def format_inventory_dict_to_display_list(inv_dict: Dict[str, int]) -> List[str]
     """
     if not inv_dict:
         return []
-    registry = get_registry()
-    result: List[str] = []
-    for item_id, qty in inv_dict.items():
-        name = registry.get_name(item_id)
-        if qty > 1:
-            result.append(f"{name} x{qty}")
-        else:
-            result.append(name)
-    return result
+    return [_format_stack(item_id, qty) for item_id, qty in inv_dict.items()]
 
 
 class Inventory:
@@ -236,10 +250,12 @@ class Inventory:
     Instance-based inventory system with quantity tracking.
     Uses ItemRegistry for static item data lookup.
     """
+    __slots__ = ("items", "_total")
     
     def __init__(self):
         """Initialize an empty inventory."""
-        self.items: Dict[str, int] = {}  # {item_id: quantity}
+        self.items: dict[str, int] = {}  # {item_id: quantity}
+        self._total = 0  # 与 items 同步维护的总数量，count_total_items 直接返回
     
     def add(self, item_id: str, qty: int = 1) -> bool:
         """
@@ -255,20 +271,24 @@ class Inventory:
         if qty <= 0:
             return False
         
-        registry = get_registry()
+        # 单次查询，堆叠规则与上限都从同一份配置读取
+        item_data = get_item_data(item_id)
+        items = self.items
+        current_qty = items.get(item_id)  # None = 尚未持有；只做这一次哈希查找
         
         # Check stacking rules
-        if not registry.is_stackable(item_id):
+        if not item_data.get("stackable", True):
             # Non-stackable items: can only have 1
-            if item_id in self.items:
+            if current_qty is not None:
                 return False  # Already have one
-            self.items[item_id] = 1
+            items[item_id] = 1
+            self._total += 1
         else:
             # Stackable items
-            current_qty = self.items.get(item_id, 0)
-            max_stack = registry.get_max_stack(item_id)
-            new_qty = min(current_qty + qty, max_stack)
-            self.items[item_id] = new_qty
+            current_qty = current_qty or 0
+            new_qty = min(current_qty + qty, item_data.get("max_stack", 99))
+            items[item_id] = new_qty
+            self._total += new_qty - current_qty
         
         return True
     
@@ -294,6 +314,7 @@ class Inventory:
             return False
         
         new_qty = current_qty - qty
+        self._total -= qty
         if new_qty <= 0:
             del self.items[item_id]
         else:
@@ -337,53 +358,29 @@ class Inventory:
         """
         if not self.items:
             return "Empty"
-        
-        registry = get_registry()
-        formatted_items: List[str] = []
-        
-        for item_id, qty in self.items.items():
-            # Get display name from registry
-            name = registry.get_name(item_id)
-            
-            # Format with quantity if more than 1
-            if qty > 1:
-                formatted_items.append(f"{name} x{qty}")
-            else:
-                formatted_items.append(name)
-        
-        return ", ".join(formatted_items)
+        # 列表推导式交给 join：join 需要两遍遍历，生成器反而会被先物化成列表
+        return ", ".join([_format_stack(item_id, qty) for item_id, qty in self.items.items()])
     
-    def list_item_names(self) -> List[str]:
+    def list_item_names(self) -> list[str]:
         """
         Get a list of item display names (with quantity when > 1) for prompt/UI.
         
         Returns:
-            List[str]: e.g. ["Healing Potion x2", "Gold Coin x10"] or []
+            list[str]: e.g. ["Healing Potion x2", "Gold Coin x10"] or []
         """
-        if not self.items:
-            return []
-        registry = get_registry()
-        result: List[str] = []
-        for item_id, qty in self.items.items():
-            name = registry.get_name(item_id)
-            if qty > 1:
-                result.append(f"{name} x{qty}")
-            else:
-                result.append(name)
-        return result
+        return format_inventory_dict_to_display_list(self.items)
     
-    def list_items_detailed(self) -> List[Dict[str, Any]]:
+    def list_items_detailed(self) -> list[dict[str, Any]]:
         """
         Get detailed information for all items in the inventory.
         
         Returns:
             List of dicts with item_id, quantity, and full item data
         """
-        registry = get_registry()
-        result: List[Dict[str, Any]] = []
+        result: list[dict[str, Any]] = []
         
         for item_id, qty in self.items.items():
-            item_data = registry.get(item_id)
+            item_data = get_item_data(item_id)
             result.append({
                 "item_id": item_id,
                 "quantity": qty,
@@ -392,16 +389,21 @@ class Inventory:
         
         return result
     
-    def to_dict(self) -> Dict[str, int]:
+    def to_dict(self, copy: bool = True) -> Mapping[str, int]:
         """
         Serialize inventory to dictionary for saving.
         
+        Args:
+            copy: Return a defensive copy (default). Pass False for a
+                read-only view over the internal dict, which skips the copy
+                but cannot be mutated by the caller.
+        
         Returns:
-            Dict[str, int]: Copy of internal item storage
+            Mapping[str, int]: A dict copy, or a read-only view if copy=False
         """
-        return self.items.copy()
+        return self.items.copy() if copy else types.MappingProxyType(self.items)
     
-    def from_dict(self, data: Dict[str, int]) -> None:
+    def from_dict(self, data: dict[str, int]) -> None:
         """
         Deserialize inventory from dictionary (for loading).
         
@@ -409,10 +411,12 @@ class Inventory:
             data: Dictionary mapping item_id to quantity
         """
         self.items = data.copy() if data else {}
+        self._total = sum(self.items.values())
     
     def clear(self) -> None:
         """Clear all items from the inventory."""
         self.items.clear()
+        self._total = 0
     
     def is_empty(self) -> bool:
         """Check if the inventory is empty."""
@@ -424,7 +428,7 @@ class Inventory:
     
     def count_total_items(self) -> int:
         """Get the total quantity of all items."""
-        return sum(self.items.values())
+        return self._total
 
 
 # Auto-load registry on module import (optional)
@@ -438,4 +442,4 @@ def init_registry(config_path: str = "config/items.yaml") -> bool:
     Returns:
         bool: True if loaded successfully
     """
-    return _registry.load(config_path)
+    return load_item_database(config_path)
@@ -29,6 +29,9 @@ class QuestManager:
         if not quests_config:
             return active_quests
         
+        # 条件字符串按文本预编译并缓存（与 mechanics.check_condition 同语义），循环内只调用闭包
+        compile_condition = mechanics.compile_condition
+        
         for quest in quests_config:
             quest_id = quest.get("id", "")
             quest_title = quest.get("title", "Unknown Quest")
@@ -38,34 +41,36 @@ class QuestManager:
             if not stages:
                 continue
             
-            # Find the current stage (last stage where condition is True)
+            # Find the current stage (last stage where condition is True):
+            # 从后往前找，命中即停，前面的阶段条件不再逐个求值
             current_stage = None
-            current_stage_id = None
-            is_completed = False
-            stage_status = "ACTIVE"  # Default status
-            
-            for stage in stages:
-                condition = stage.get("condition", "True")
-                # Use mechanics.check_condition to evaluate
-                if mechanics.check_condition(condition, flags):
+            current_index = 0
+            for current_index in range(len(stages) - 1, -1, -1):
+                stage = stages[current_index]
+                if compile_condition(stage.get("condition", "True"))(flags):
                     current_stage = stage
-                    current_stage_id = stage.get("id", "")
-                    # Get the status from the stage (defaults to "ACTIVE")
-                    stage_status = stage.get("status", "ACTIVE")
-                    # Check if this stage is marked as completed
-                    if stage_status == "COMPLETED":
-                        is_completed = True
+                    break
             
             # Only add quest if we found a matching stage
-            if current_stage:
-                active_quests.append({
-                    "id": quest_id,
-                    "title": quest_title,
-                    "description": quest_description,
-                    "stage_id": current_stage_id,
-                    "stage_description": current_stage.get("description", ""),
-                    "completed": is_completed,
-                    "status": stage_status
-                })
+            if not current_stage:
+                continue
+            
+            # Get the status from the stage (defaults to "ACTIVE")
+            stage_status = current_stage.get("status", "ACTIVE")
+            # 任一已满足的 COMPLETED 阶段都算完成：当前阶段之前只需检查标了 COMPLETED 的阶段
+            is_completed = stage_status == "COMPLETED" or any(
+                stage.get("status", "ACTIVE") == "COMPLETED"
+                and compile_condition(stage.get("condition", "True"))(flags)
+                for stage in stages[:current_index]
+            )
+            active_quests.append({
+                "id": quest_id,
+                "title": quest_title,
+                "description": quest_description,
+                "stage_id": current_stage.get("id", ""),
+                "stage_description": current_stage.get("description", ""),
+                "completed": is_completed,
+                "status": stage_status
+            })
         
         return active_quests
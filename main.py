@@ -25,20 +25,19 @@ def _speaker_display_name(speaker_id: str) -> str:
     return names.get(normalized, (speaker_id or "未知").capitalize())
 
 
+def _message_field(message: Any, key: str) -> Any:
+    """从 dict 或 LangChain message 取字段，两种消息形态共用一处判断。"""
+    if isinstance(message, dict):
+        return message.get(key)
+    return getattr(message, key, None)
+
+
 def _get_last_ai_content(messages: List[Any]) -> str:
     """从 messages 中提取最后一条 AI 消息的内容。"""
-    if not messages:
-        return ""
-    for message in reversed(messages):
-        role = getattr(message, "type", None) or (
-            message.get("type") if isinstance(message, dict) else None
-        )
+    for message in reversed(messages or []):
+        role = _message_field(message, "type") or _message_field(message, "role")
         if role in ("ai", "assistant"):
-            return getattr(message, "content", None) or (
-                message.get("content", "") if isinstance(message, dict) else ""
-            )
-        if isinstance(message, dict) and message.get("role") == "assistant":
-            return message.get("content", "")
+            return _message_field(message, "content") or ""
     return ""
 
 
@@ -46,21 +45,14 @@ def _iter_history_messages(messages: List[Any]) -> List[Tuple[str, str]]:
     """将历史消息规整为 (role, content) 便于终端展示。"""
     history: List[Tuple[str, str]] = []
     for message in messages:
-        role = getattr(message, "type", None) or (
-            message.get("type") if isinstance(message, dict) else None
-        )
-        content = getattr(message, "content", None) or (
-            message.get("content", "") if isinstance(message, dict) else ""
-        )
-        name = getattr(message, "name", None) or (
-            message.get("name") if isinstance(message, dict) else None
-        )
+        content = _message_field(message, "content")
         if not content:
             continue
+        role = _message_field(message, "type")
         if role in ("human", "user"):
             history.append(("You", content))
         elif role in ("ai", "assistant"):
-            history.append((_speaker_display_name(name or ""), content))
+            history.append((_speaker_display_name(_message_field(message, "name") or ""), content))
     return history
 
 
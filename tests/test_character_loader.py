@@ -0,0 +1,35 @@
+"""
+角色卡模板归一化测试：浅拷贝补全字段，不改动 YAML 原数据。
+"""
+
+import copy
+
+from characters.loader import load_character, normalize_character_attributes_for_template
+
+
+def test_normalize_fills_template_fields_without_touching_source():
+    raw = {
+        "name": "Scratch",
+        "base_stats": {"wis": 14},
+        "personality": {"speech_style": ["Tone: cheerful", "Woof"]},
+    }
+    snapshot = copy.deepcopy(raw)
+
+    out = normalize_character_attributes_for_template(raw)
+
+    assert raw == snapshot
+    assert out["ability_scores"]["WIS"] == 14 and out["ability_scores"]["STR"] == 10
+    assert out["dialogue_style"] == {"tone": "cheerful", "common_phrases": ["Woof"]}
+    assert out["race"] == ""
+    assert out["personality"] is raw["personality"]
+
+
+def test_character_render_prompt_is_repeatable_and_keeps_data_intact():
+    character = load_character("shadowheart")
+    snapshot = copy.deepcopy(character.data)
+
+    first = character.render_prompt(relationship_score=30, flags={"met_player": True})
+    second = character.render_prompt(relationship_score=30, flags={"met_player": True})
+
+    assert first == second
+    assert character.data == snapshot
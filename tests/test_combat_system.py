@@ -1778,6 +1778,7 @@ def test_disarm_intent_successfully_disables_visible_trap(mock_roll_d20):
 
     assert "trap_tripwire_1" not in result["entities"]
     assert "成功解除了 绊线陷阱" in "\n".join(result["journal_events"])
+    assert mock_roll_d20.call_args.kwargs["format_log"] is False
 
 
 @patch("core.systems.mechanics.roll_d20")
@@ -1811,6 +1812,7 @@ def test_unlock_intent_opens_locked_chest(mock_roll_d20):
     assert chest["is_locked"] is False
     assert chest["status"] == "opened"
     assert "成功打开了 上锁的旅行箱" in "\n".join(result["journal_events"])
+    assert mock_roll_d20.call_args.kwargs["format_log"] is False
 
 
 @patch("core.systems.mechanics.roll_d20")
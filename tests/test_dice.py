@@ -0,0 +1,93 @@
+"""
+D20 掷骰：掷骰模式分派、大成功/大失败判定与日志格式。
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from core.systems.dice import (
+    CheckResult,
+    RollType,
+    get_check_result_text,
+    roll_d20,
+)
+
+
+@pytest.fixture(autouse=True)
+def _real_dice(monkeypatch):
+    # 仓库默认开启开发者「必定大成功」开关；这里测真实掷骰
+    monkeypatch.setattr("core.engine.physics.DEBUG_ALWAYS_PASS_CHECKS", False)
+
+
+@pytest.mark.parametrize(
+    ("roll_type", "rolls", "raw_roll"),
+    [
+        ("normal", [7], 7),
+        ("ADVANTAGE", [7, 15], 15),
+        ("disadvantage", [7, 15], 7),
+        (RollType.ADVANTAGE, [7, 15], 15),
+        (RollType.DISADVANTAGE, [7, 15], 7),
+        ("sideways", [7], 7),
+    ],
+)
+def test_roll_d20_dispatches_on_roll_type(roll_type, rolls, raw_roll):
+    with patch("core.systems.dice.random.randint", side_effect=[7, 15]):
+        result = roll_d20(dc=10, modifier=2, roll_type=roll_type)
+
+    assert result["rolls"] == rolls
+    assert result["raw_roll"] == raw_roll
+    assert result["total"] == raw_roll + 2
+    assert result["is_success"] is (raw_roll + 2 >= 10)
+
+
+def test_roll_d20_natural_rolls_override_dc_and_format_log():
+    with patch("core.systems.dice.random.randint", side_effect=[20]):
+        crit = roll_d20(dc=30, modifier=-5)
+    with patch("core.systems.dice.random.randint", side_effect=[1, 3]):
+        fumble = roll_d20(dc=2, modifier=10, roll_type=RollType.DISADVANTAGE)
+
+    assert crit["result_type"] is CheckResult.CRITICAL_SUCCESS and crit["is_success"] is True
+    assert crit["log_str"] == "🎲 (20) + -5 = 15 vs DC 30 [CRITICAL_SUCCESS]"
+    assert fumble["result_type"] is CheckResult.CRITICAL_FAILURE and fumble["is_success"] is False
+    assert fumble["log_str"] == "🎲 [DIS] (1, 3) -> 1 + +10 = 11 vs DC 2 [CRITICAL_FAILURE]"
+
+
+def test_roll_d20_dev_mode_forces_natural_twenty(monkeypatch):
+    monkeypatch.setattr("core.engine.physics.DEBUG_ALWAYS_PASS_CHECKS", True)
+
+    result = roll_d20(dc=25, modifier=1, roll_type="advantage")
+
+    assert result["rolls"] == [20, 20]
+    assert result["result_type"] is CheckResult.CRITICAL_SUCCESS
+    assert result["log_str"].startswith("🎲 [ADV] (20, 20) -> 20 + +1 = 21 vs DC 25")
+
+
+def test_get_check_result_text_covers_every_result_type():
+    texts = {get_check_result_text({"result_type": result}) for result in CheckResult}
+
+    assert len(texts) == len(CheckResult)
+    assert get_check_result_text({"result_type": CheckResult.SUCCESS}) == (
+        "Check Result: SUCCESS. The action succeeds."
+    )
+    assert get_check_result_text({"result_type": "SUCCESS"}) == "Check Result: Unknown result."
+    assert get_check_result_text({}) == "Check Result: Unknown result."
+
+
+@pytest.mark.parametrize(
+    ("raw_roll", "dc", "expected"),
+    [
+        (20, 40, (True, CheckResult.CRITICAL_SUCCESS)),
+        (1, -5, (False, CheckResult.CRITICAL_FAILURE)),
+        (10, 12, (True, CheckResult.SUCCESS)),
+        (9, 12, (False, CheckResult.FAILURE)),
+    ],
+)
+def test_roll_d20_outcome_table_and_optional_log(raw_roll, dc, expected):
+    with patch("core.systems.dice.random.randint", return_value=raw_roll):
+        result = roll_d20(dc=dc, modifier=2, format_log=False)
+
+    assert (result["is_success"], result["result_type"]) == expected
+    assert result["total"] == raw_roll + 2
+    assert result["log_str"] == ""
+
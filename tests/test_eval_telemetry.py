@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import json
+from types import SimpleNamespace
 
 import pytest
 
@@ -8,6 +9,7 @@ from core.eval.telemetry import (
     InMemoryTelemetrySink,
     JsonlTelemetrySink,
     emit_telemetry,
+    extract_token_usage,
     telemetry_scope,
 )
 
@@ -49,3 +51,33 @@ def test_telemetry_scope_routes_emit_and_rejects_unknown_events():
     assert len(sink.events) == 2
     assert sink.events[0]["event_name"] == "turn_started"
     assert sink.summary()["total_duration_ms"] == 7
+
+
+@pytest.mark.parametrize(
+    ("payload", "expected"),
+    [
+        (
+            SimpleNamespace(usage=SimpleNamespace(prompt_tokens=7, completion_tokens=3, total_tokens=10)),
+            {"prompt_tokens": 7, "completion_tokens": 3, "total_tokens": 10},
+        ),
+        (
+            SimpleNamespace(usage=SimpleNamespace(prompt_tokens=7)),
+            {"prompt_tokens": 7, "completion_tokens": 0, "total_tokens": 0},
+        ),
+        (
+            {"usage": {"input_tokens": 4, "output_tokens": 2}},
+            {"prompt_tokens": 4, "completion_tokens": 2, "total_tokens": 6},
+        ),
+        (
+            SimpleNamespace(usage=SimpleNamespace(), usage_metadata={"input_tokens": 5, "output_tokens": 1}),
+            {"prompt_tokens": 5, "completion_tokens": 1, "total_tokens": 6},
+        ),
+        (
+            {"usage": {}, "response_metadata": {"token_usage": {"total_tokens": 9}}},
+            {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 9},
+        ),
+        (None, {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}),
+    ],
+)
+def test_extract_token_usage_handles_sdk_and_langchain_shapes(payload, expected):
+    assert extract_token_usage(payload) == expected
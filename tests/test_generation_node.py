@@ -79,6 +79,20 @@ def test_build_environmental_awareness_collects_location_and_object_snapshot():
     assert awareness["current_env_objs"] is not state["environment_objects"]
 
 
+def test_message_to_dict_maps_roles_for_dicts_and_langchain_messages():
+    assert generation._message_to_dict(HumanMessage(content="你好")) == {"role": "user", "content": "你好"}
+    assert generation._message_to_dict(AIMessage(content="哼。")) == {"role": "assistant", "content": "哼。"}
+    assert generation._message_to_dict(ToolMessage(content="x", tool_call_id="t1")) == {
+        "role": "user",
+        "content": "x",
+    }
+    assert generation._message_to_dict({"role": "assistant", "content": "a"}) == {
+        "role": "assistant",
+        "content": "a",
+    }
+    assert generation._message_to_dict({"role": "system", "content": "s"}) == {"role": "user", "content": "s"}
+
+
 def test_build_history_dicts_injects_physical_action_suffix_verbatim():
     state = {"messages": []}
     context = {
@@ -220,6 +234,30 @@ def test_parse_and_apply_actions_updates_state_and_executes_physical_action():
     assert current_entities["shadowheart"]["memory_awakening"] == 35
 
 
+def test_assemble_generation_output_keeps_empty_thought_process():
+    context = {
+        "speaker": "shadowheart",
+        "user_input": "",
+        "is_first_npc_of_player_turn": False,
+        "prev_responses": [],
+        "current_entities": {},
+        "trigger_result": {"journal_entries": []},
+        "triggers_config": [],
+    }
+    parsed_result = {
+        "clean_text": "……",
+        "thought_process": "",
+        "tool_physics_events": [],
+        "state_changes_applied": False,
+        "idle_merged": None,
+    }
+
+    out = generation._assemble_generation_output({"entities": {}}, context, parsed_result)
+
+    assert out["thought_process"] == ""
+    assert out["final_response"] == "……"
+
+
 def test_generation_node_delegates_to_helpers_and_preserves_output_shape():
     node = generation.create_generation_node()
     state = {
@@ -453,3 +491,54 @@ def test_generation_node_does_not_load_character_for_environment_door_target():
     assert result["speaker_responses"][0][0] == "shadowheart"
     assert "heavy_oak_door_1" not in loaded_names
     assert "shadowheart" in loaded_names
+
+
+def test_system_rules_prompt_is_rendered_once_and_reused():
+    generation._system_rules_prompt.cache_clear()
+
+    first = generation._system_rules_prompt()
+    with patch.object(generation, "_prompt_environment", side_effect=AssertionError("re-rendered")):
+        second = generation._system_rules_prompt()
+
+    assert first and first is second
+    assert generation._prompt_environment() is generation._prompt_environment()
+
+
+def test_trim_history_by_tokens_keeps_newest_messages_within_budget():
+    messages = [{"role": "user", "content": "甲" * 40} for _ in range(3)]
+    messages.append({"role": "user", "content": "最新"})
+
+    trimmed = generation._trim_history_by_tokens(messages, max_messages=20, token_budget=50)
+
+    assert trimmed == messages[-2:]
+    assert generation._trim_history_by_tokens(messages, max_messages=3, token_budget=10_000) == messages[-3:]
+
+
+def test_trim_history_by_tokens_always_keeps_latest_message():
+    oversized = [{"role": "user", "content": "乙" * 500}]
+
+    assert generation._trim_history_by_tokens(oversized, token_budget=10) == oversized
+    assert generation._trim_history_by_tokens([]) == []
+
+
+def test_create_llm_client_reuses_instances_per_configuration(monkeypatch):
+    built = []
+
+    class _FakeChat:
+        def __init__(self, **kwargs):
+            built.append(kwargs)
+
+        def bind_tools(self, tools):
+            return ("bound", self, tuple(tools))
+
+    generation._cached_llm_client.cache_clear()
+    monkeypatch.setattr(generation, "ChatOpenAI", _FakeChat)
+
+    tools_client = generation._create_llm_client(False)
+    banter_client = generation._create_llm_client(True)
+
+    assert generation._create_llm_client(False) is tools_client
+    assert generation._create_llm_client(True) is banter_client
+    assert tools_client[0] == "bound" and isinstance(banter_client, _FakeChat)
+    assert len(built) == 2
+    generation._cached_llm_client.cache_clear()
@@ -0,0 +1,32 @@
+"""
+归档 InputHandler：斜杠命令解析（多余的尾随参数不影响前几段）。
+"""
+
+from unittest.mock import MagicMock
+
+from archive.v1_legacy.input_handler import InputHandler
+
+
+def test_roll_command_ignores_trailing_arguments():
+    handler = InputHandler(MagicMock())
+    handler._roll_d20 = MagicMock(
+        return_value={"result_type": MagicMock(value="SUCCESS"), "total": 18}
+    )
+    context = {"attributes": {"ability_scores": {"STR": 14}}}
+
+    reply = handler.handle("/roll STR 15 extra words", context)
+
+    assert reply == "Skill Check Result: SUCCESS (Rolled 18 vs DC 15)."
+    assert handler._roll_d20.call_args.args[:2] == (15, 2)
+
+
+def test_give_command_uses_first_argument_as_item_key():
+    handler = InputHandler(MagicMock())
+    player_inv = MagicMock()
+    player_inv.has.return_value = True
+    context = {"player_inventory": player_inv, "journal": MagicMock()}
+
+    handler.handle("/give healing_potion please", context)
+
+    player_inv.has.assert_called_once_with("healing_potion")
+    player_inv.remove.assert_called_once_with("healing_potion")
@@ -0,0 +1,78 @@
+"""
+归档 MemoryManager：存档 JSON 编解码（orjson 与标准库回退）。
+"""
+
+import pytest
+
+from archive.v1_legacy import memory as memory_mod
+from archive.v1_legacy.memory import MemoryManager
+
+SAVE = {
+    "relationship_score": 12,
+    "history": [{"role": "user", "content": "影心，你好"}],
+    "flags": {"met_astarion": True},
+    "summary": "在废墟里发现了一枚神器 ✨",
+}
+
+
+@pytest.fixture(params=["orjson", "json"])
+def codec(request, monkeypatch):
+    if request.param == "orjson":
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(memory_mod, "orjson", None)
+    return request.param
+
+
+def test_save_and_load_round_trip_keeps_non_ascii_text(tmp_path, codec):
+    manager = MemoryManager(save_dir=str(tmp_path))
+
+    assert manager.save(SAVE) is True
+    raw = (tmp_path / "shadowheart_memory.json").read_bytes()
+    loaded = manager.load()
+
+    assert "影心".encode("utf-8") in raw
+    assert loaded["history"] == SAVE["history"]
+    assert loaded["summary"] == SAVE["summary"]
+    assert loaded["relationship_score"] == 12
+
+
+def test_load_accepts_bom_prefixed_save(tmp_path, codec):
+    manager = MemoryManager(save_dir=str(tmp_path))
+    (tmp_path / "shadowheart_memory.json").write_bytes(
+        b"\xef\xbb\xbf" + memory_mod._dumps(SAVE)
+    )
+
+    loaded = manager.load()
+
+    assert loaded["summary"] == SAVE["summary"]
+    assert loaded["flags"] == {"met_astarion": True}
+
+
+def test_failed_replace_keeps_previous_save_and_removes_tmp(tmp_path, monkeypatch):
+    manager = MemoryManager(save_dir=str(tmp_path))
+    assert manager.save(SAVE) is True
+    previous = (tmp_path / "shadowheart_memory.json").read_bytes()
+
+    def broken_replace(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(memory_mod.os, "replace", broken_replace)
+
+    assert manager.save({**SAVE, "summary": "不该写进去"}) is False
+    assert (tmp_path / "shadowheart_memory.json").read_bytes() == previous
+    assert not (tmp_path / "shadowheart_memory.json.tmp").exists()
+
+
+def test_load_fills_missing_keys_from_defaults(tmp_path):
+    manager = MemoryManager(save_dir=str(tmp_path))
+    assert manager.save({"relationship_score": None, "summary": "只存了摘要"}) is True
+
+    loaded = manager.load(default_relationship=5)
+
+    assert loaded["summary"] == "只存了摘要"
+    assert loaded["relationship_score"] == 5
+    assert loaded["history"] == []
+    assert loaded["npc_state"] == {"status": "NORMAL", "duration": 0}
+    assert loaded["inventory_player"] == {}
+    assert loaded["journal"] == []
@@ -262,3 +262,16 @@ def test_lore_node_diary_actor_scoped_clue_not_visible_to_other_actor(monkeypatc
     assert player_flags["necromancer_lab_antidote_formula_fragment_known"] is True
     assert "necromancer_lab_antidote_formula_fragment_known" not in astarion_flags
     assert astarion_flags["necromancer_lab_key_hint_known"] is True
+
+
+def test_lore_openai_client_is_created_once_and_reused(monkeypatch):
+    import core.graph.nodes.lore as lore
+
+    created = []
+    monkeypatch.setattr(lore, "_client", None)
+    monkeypatch.setattr(lore, "OpenAI", lambda **kwargs: created.append(kwargs) or object())
+
+    first = lore._get_openai_client()
+
+    assert lore._get_openai_client() is first
+    assert len(created) == 1
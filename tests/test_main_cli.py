@@ -96,3 +96,19 @@ def test_render_turn_output_prints_system_response_for_command_done():
     ]
     assert ui.npc_streams == []
     assert ui.dm_narrations == []
+
+
+def test_history_helpers_accept_dict_and_langchain_messages():
+    from langchain_core.messages import AIMessage, HumanMessage
+
+    messages = [
+        HumanMessage(content="你好"),
+        {"type": "ai", "content": "", "name": "shadowheart"},
+        AIMessage(content="嗯？", name="shadowheart"),
+        {"role": "assistant", "content": "……"},
+    ]
+
+    assert main._get_last_ai_content(messages) == "……"
+    assert main._get_last_ai_content(messages[:3]) == "嗯？"
+    assert main._get_last_ai_content([]) == ""
+    assert main._iter_history_messages(messages) == [("You", "你好"), ("影心", "嗯？")]
@@ -0,0 +1,424 @@
+"""
+规则层纯函数测试：属性调整值、属性名归一、被动 DC 等不依赖图与 LLM 的小工具。
+"""
+
+import pytest
+
+from core.systems import mechanics
+
+
+def test_calculate_ability_modifier_matches_5e_formula_inside_and_outside_table():
+    for score in range(-5, 60):
+        assert mechanics.calculate_ability_modifier(score) == (score - 10) // 2
+    assert mechanics.calculate_ability_modifier(15.0) == 2
+    assert mechanics.get_ability_modifiers({"STR": 8, "DEX": 18}) == {"STR": -1, "DEX": 4}
+
+
+def test_entity_ability_modifier_reads_exact_then_case_insensitive_keys():
+    assert mechanics._get_ability_modifier({"ability_scores": {"DEX": 18}}, "DEX") == 4
+    assert mechanics._get_ability_modifier({"ability_scores": {" dex ": "14"}}, "DEX") == 2
+    assert mechanics._get_ability_modifier({"wis": 6}, "WIS") == -2
+    assert mechanics._get_ability_modifier({"ability_scores": {"STR": 50}}, "STR") == 20
+    assert mechanics._get_ability_modifier({}, "CHA", 16) == 3
+
+
+def test_ability_lookups_use_frozen_module_tables():
+    assert mechanics.normalize_ability_name(" wisdom ") == "WIS"
+    assert mechanics.normalize_ability_name("luck") is None
+    assert mechanics.get_ability_for_action(" stealth") == "DEX"
+    assert mechanics.get_ability_for_action(None) == "CHA"
+    assert mechanics.get_ability_for_action("DANCE") == "CHA"
+
+
+def test_calculate_passive_dc_only_for_social_checks():
+    npc = {"ability_scores": {"WIS": 14}}
+
+    for action in ("DECEPTION", "PERSUASION", "INTIMIDATION"):
+        assert mechanics.calculate_passive_dc(action, npc) == 12
+    assert mechanics.calculate_passive_dc("PERSUASION", {}) == 10
+    assert mechanics.calculate_passive_dc("STEALTH", npc) is None
+    for wis in (-3, 0, 1, 9, 10, 11, 20, 40, 41, 99, 15.0):
+        expected = 10 + mechanics.calculate_ability_modifier(wis)
+        assert mechanics.calculate_passive_dc("DECEPTION", {"ability_scores": {"WIS": wis}}) == expected
+
+
+def test_keyword_matcher_reports_every_group_including_overlapping_prefixes():
+    groups = (("dark",), ("darkness",), ("light", "sun"), ())
+
+    assert mechanics._match_keyword_groups("the darkness falls", groups) == {0, 1}
+    assert mechanics._match_keyword_groups("sunrise over the dark", groups) == {0, 2}
+    assert mechanics._match_keyword_groups("nothing here", groups) == set()
+    assert mechanics._match_keyword_groups("anything", ((),)) == set()
+
+
+def test_keyword_matcher_prefilters_on_first_characters():
+    groups = (("dark",), ("light",))
+
+    assert mechanics._compile_keyword_matcher(groups)[1] == frozenset("dl")
+    assert mechanics._match_keyword_groups("xyz 123", groups) == set()
+    assert mechanics._compile_keyword_matcher((("",), ("dark",)))[1] is None
+    assert mechanics._match_keyword_groups("xyz", (("",), ("dark",))) == {0}
+
+    flags: dict = {}
+    triggers = [{"id": "t", "trigger_type": "keyword_match", "keywords": ["dark"], "approval_change": 2,
+                 "effects": ["flags.seen = True"]}]
+    assert mechanics.process_dialogue_triggers("hello", triggers, flags) == {
+        "journal_entries": [],
+        "relationship_delta": 0,
+    }
+    assert flags == {}
+
+
+def test_situational_bonus_and_triggers_match_keywords_in_one_pass():
+    rules = [
+        {"trigger_type": "keyword_match", "keywords": ["shar"], "applicable_actions": ["ALL"],
+         "bonus_value": 2, "description": "信仰"},
+        {"trigger_type": "keyword_match", "keywords": ["shared past"], "applicable_actions": ["PERSUASION"],
+         "bonus_value": 3, "description": "往事"},
+        {"trigger_type": "keyword_match", "keywords": ["moon"], "applicable_actions": ["ALL"],
+         "bonus_value": 5, "description": "月亮"},
+    ]
+
+    assert mechanics.get_situational_bonus([], "PERSUASION", rules, {}, "Our Shared Past") == (5, "信仰, 往事")
+    assert mechanics.get_situational_bonus([], "DECEPTION", rules, {}, "our shared past") == (2, "信仰")
+
+    triggers = [
+        {"id": "relic", "trigger_type": "keyword_match", "keywords": ["Artifact"], "approval_change": 4,
+         "effects": ["flags.relic_seen = True"]},
+        {"id": "other", "trigger_type": "keyword_match", "keywords": ["tadpole"]},
+    ]
+    flags: dict = {}
+    result = mechanics.process_dialogue_triggers("Show me the ARTIFACT", triggers, flags)
+
+    assert result["relationship_delta"] == 4
+    assert flags == {"relic_seen": True}
+    assert result["journal_entries"] == ["[Story Trigger] relic: triggered"]
+
+
+def test_keywords_of_caches_lowercase_keywords_until_they_change():
+    rule = {"keywords": ["Shar", "NIGHT"]}
+
+    assert mechanics._keywords_of(rule) == ("shar", "night")
+    assert mechanics._keywords_of({}) == ()
+    cached = rule["_keywords_lc"]
+    assert mechanics._keywords_of(rule) is cached
+
+    rule["keywords"].append("Moon")
+    assert mechanics._keywords_of(rule) == ("shar", "night", "moon")
+
+
+def test_compile_effects_tags_flag_and_give_entries():
+    compiled = mechanics.compile_effects(
+        ["flags.met_shar = True", "inventory.give: healing_potion", "flags. = 1", "shout loudly"]
+    )
+
+    assert compiled == (("flag", "met_shar", True), ("give", "healing_potion"))
+    assert mechanics.update_flags("flags.door = 'open'", {}) == {"door": "open"}
+
+
+def test_flag_changes_are_logged_only_at_debug_level(caplog, capsys):
+    with caplog.at_level("INFO", logger=mechanics.logger.name):
+        mechanics.update_flags("flags.door = 'open'", {})
+    assert not caplog.records
+
+    with caplog.at_level("DEBUG", logger=mechanics.logger.name):
+        mechanics.update_flags("flags.door = 'open'", {"door": "closed"})
+        mechanics.update_flags("flags.door = 'open'", {"door": "open"})
+    assert [record.getMessage() for record in caplog.records] == ["[flags] door: 'closed' -> 'open'"]
+    assert capsys.readouterr().out == ""
+
+
+def test_parse_literal_matches_literal_eval_fallback_semantics():
+    assert mechanics._parse_literal("True") is True
+    assert mechanics._parse_literal(" -3 ") == -3
+    assert mechanics._parse_literal("2.5") == 2.5
+    assert mechanics._parse_literal("'open'") == "open"
+    assert mechanics._parse_literal("[1, 2]") == [1, 2]
+    assert mechanics._parse_literal("007") == "007"
+    assert mechanics._parse_literal("inf") == "inf"
+    assert mechanics.check_condition("flags.count == 3", {"count": 3}) is True
+    assert mechanics.check_condition("flags.door != 'open'", {"door": "open"}) is False
+
+
+def test_compile_condition_returns_cached_predicates():
+    predicate = mechanics.compile_condition("flags.met_shar == True")
+
+    assert predicate is mechanics.compile_condition("flags.met_shar == True")
+    assert predicate({"met_shar": True}) is True
+    assert predicate({}) is False
+    assert mechanics.compile_condition(None)({}) is True
+    assert mechanics.compile_condition(" True ")({}) is True
+    assert mechanics.compile_condition("met_shar == True")({"met_shar": True}) is False
+
+
+def test_situational_bonus_skips_history_when_no_rule_applies_to_action():
+    class _ExplodingHistory(list):
+        def __reversed__(self):
+            raise AssertionError("history should not be scanned")
+
+    rules = [{"trigger_type": "keyword_match", "keywords": ["shar"], "applicable_actions": ["PERSUASION"],
+              "bonus_value": 2}]
+
+    assert mechanics.get_situational_bonus(_ExplodingHistory(), "STEALTH", rules, {}) == (0, "")
+    assert mechanics.get_situational_bonus([{"role": "user", "content": "For Shar"}], "PERSUASION", rules, {}) == (2, "")
+
+
+def test_resolve_social_roll_matches_separate_helpers():
+    for action in ("PERSUASION", "DECEPTION", "INTIMIDATION", "STEALTH"):
+        for relationship in range(-100, 101, 5):
+            assert mechanics.resolve_social_roll(action, relationship) == (
+                mechanics.calculate_relationship_modifier(relationship, action),
+                mechanics.determine_roll_type(action, relationship),
+            )
+
+
+@pytest.mark.parametrize(
+    "module_name",
+    ["core.systems.mechanics", "core.systems.dice", "core.systems.inventory", "core.systems.quest"],
+)
+def test_rules_modules_define_each_top_level_function_once(module_name):
+    import ast
+    import collections
+    import importlib
+    import inspect
+
+    tree = ast.parse(inspect.getsource(importlib.import_module(module_name)))
+    names = collections.Counter(
+        node.name for node in tree.body if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef))
+    )
+
+    assert [name for name, count in names.items() if count > 1] == []
+    if module_name == "core.systems.mechanics":
+        assert names["parse_dice_string"] == names["apply_item_effect"] == 1
+
+
+def test_mechanics_passes_roll_type_enum_for_fixed_roll_modes():
+    import ast
+    import inspect
+
+    tree = ast.parse(inspect.getsource(mechanics))
+    literal_modes = [
+        keyword.value.value
+        for node in ast.walk(tree)
+        if isinstance(node, ast.Call) and getattr(node.func, "id", None) == "roll_d20"
+        for keyword in node.keywords
+        if keyword.arg == "roll_type" and isinstance(keyword.value, ast.Constant)
+    ]
+
+    assert literal_modes == []
+
+
+def test_update_npc_state_counts_down_then_resets_to_normal():
+    assert mechanics.update_npc_state("SILENT", 3) == ("SILENT", 2)
+    assert mechanics.update_npc_state("SILENT", 1) == ("NORMAL", 0)
+    assert mechanics.update_npc_state("VULNERABLE", 0) == ("NORMAL", 0)
+    assert mechanics.update_npc_state("VULNERABLE", -4) == ("NORMAL", 0)
+
+
+def test_build_rules_normalizes_dicts_once_into_slotted_rules():
+    config = [
+        {"trigger_type": "keyword_match", "keywords": ["Shar"], "applicable_actions": ["PERSUASION", "DECEPTION"],
+         "bonus_value": 2},
+        {"applicable_actions": ["ALL"]},
+        {},
+    ]
+
+    rules = mechanics.build_rules(config)
+
+    assert rules[0].keywords_lc == ("shar",)
+    assert rules[0].applicable_actions == frozenset({"PERSUASION", "DECEPTION"})
+    assert rules[0].applies_to("DECEPTION") is True
+    assert rules[0].applies_to("INTIMIDATION") is False
+    assert rules[1].applies_to("STEALTH") is True
+    assert rules[2].applies_to("STEALTH") is False
+    assert rules[2].bonus_value == 0
+    assert mechanics.build_rules(config) == rules
+    assert mechanics.build_rules(list(rules)) == rules
+    assert not hasattr(rules[0], "__dict__")
+    assert "_rule" not in config[0]
+
+    config[0]["keywords"] = ["Selune"]
+    config[0]["bonus_value"] = 5
+    rebuilt = mechanics.build_rules(config)[0]
+    assert (rebuilt.keywords_lc, rebuilt.bonus_value) == (("selune",), 5)
+
+
+def test_build_triggers_precompiles_effects_and_journal_entry():
+    triggers = mechanics.build_triggers(
+        [
+            {"id": "relic", "trigger_type": "keyword_match", "keywords": ["Relic"], "approval_change": "lots",
+             "effects": ["flags.relic = True"], "description": "found it"},
+            {"trigger_type": "keyword_match", "system_message": "Shadowheart takes the relic.", "approval_change": 3},
+        ]
+    )
+
+    assert triggers[0].effects == (("flag", "relic", True),)
+    assert triggers[0].approval_change == 0
+    assert triggers[0].journal_entry == "[Story Trigger] relic: found it"
+    assert triggers[1].journal_entry == "Shadowheart takes the relic."
+    assert triggers[1].approval_change == 3
+
+    config = [{"trigger_type": "keyword_match", "keywords": ["relic"], "effects": ["flags.a = True"]}]
+    assert mechanics.build_triggers(config)[0].effects == (("flag", "a", True),)
+    config[0]["effects"] = ["inventory.give: relic"]
+    assert mechanics.build_triggers(config)[0].effects == (("give", "relic"),)
+    assert "_trigger" not in config[0]
+
+
+class _NoLowerStr(str):
+    def lower(self):
+        raise AssertionError("message should not be lowercased")
+
+
+def test_keyword_free_configs_skip_lowercasing_the_message():
+    flags: dict = {}
+    triggers = [{"id": "q", "trigger_type": "quest_update", "keywords": ["dark"]}, {"trigger_type": "keyword_match"}]
+    rules = [{"trigger_type": "flag_only", "keywords": ["dark"], "applicable_actions": ["ALL"], "bonus_value": 9}]
+
+    assert mechanics.process_dialogue_triggers(_NoLowerStr("DARK"), triggers, flags) == {
+        "journal_entries": [],
+        "relationship_delta": 0,
+    }
+    assert mechanics.get_situational_bonus([], "PERSUASION", rules, flags, _NoLowerStr("DARK")) == (0, "")
+
+
+def test_parse_dice_string_caches_formula_and_rolls_each_die(monkeypatch):
+    rolls = iter([3, 4, 1])
+    monkeypatch.setattr(mechanics.random, "randint", lambda low, high: next(rolls))
+
+    assert mechanics.parse_dice_string("2d4+2") == 9
+    assert mechanics.parse_dice_string("1d6-3") == -2
+    assert mechanics.parse_dice_string("12") == 12
+    assert mechanics.parse_dice_string(7) == 7
+    assert mechanics.parse_dice_string("-3") == 0
+    assert mechanics.parse_dice_string("heal") == 0
+    assert mechanics._parse_dice_formula("2d4+2") == (2, 4, 2)
+    assert mechanics._parse_dice_formula("1d6-3") == (1, 6, -3)
+    assert mechanics._parse_dice_formula("3d8 fire") == (3, 8, 0)
+
+
+def test_parse_dice_string_rolls_large_pools_in_one_batch(monkeypatch):
+    monkeypatch.setattr(mechanics.random, "randint", lambda low, high: high)
+    assert mechanics.parse_dice_string("7d6+2") == 44
+
+    def _no_randint(low, high):
+        raise AssertionError("pools of 8+ dice should not roll die by die")
+
+    monkeypatch.setattr(mechanics.random, "randint", _no_randint)
+    for _ in range(50):
+        total = mechanics.parse_dice_string("10d6+2")
+        assert 12 <= total <= 62
+    assert mechanics.parse_dice_string("8d1-8") == 0
+
+
+def test_dice_pool_decomposes_one_draw_into_uniform_faces(monkeypatch):
+    # 3d6：draw = f0 + 6*f1 + 36*f2，各位即每颗骰子的 (点数 - 1)
+    monkeypatch.setattr(mechanics.random, "randrange", lambda bound: 5 + 6 * 2 + 36 * 0)
+    assert mechanics._roll_dice_pool(3, 6) == 6 + 3 + 1
+
+    monkeypatch.undo()
+    counts = {}
+    for _ in range(6000):
+        total = mechanics._roll_dice_pool(3, 2)
+        counts[total] = counts.get(total, 0) + 1
+    assert sorted(counts) == [3, 4, 5, 6]
+    assert 500 < counts[3] < 1000 and 1900 < counts[4] < 2600
+
+
+def test_quest_stages_use_compiled_conditions():
+    from core.systems.quest import QuestManager
+
+    quests = [
+        {"id": "relic", "title": "The Relic", "stages": [
+            {"id": "start", "condition": "True", "description": "find it"},
+            {"id": "found", "condition": "flags.relic_seen == True", "description": "found it", "status": "COMPLETED"},
+        ]},
+        {"id": "empty", "stages": []},
+    ]
+    mechanics.compile_condition.cache_clear()
+
+    assert QuestManager.check_quests(quests, {})[0]["stage_id"] == "start"
+    result = QuestManager.check_quests(quests, {"relic_seen": True})
+
+    assert [(quest["id"], quest["stage_id"], quest["completed"]) for quest in result] == [("relic", "found", True)]
+    assert mechanics.compile_condition.cache_info().misses == 2
+
+
+class _FakeAutomaton:
+    """最小的 ahocorasick.Automaton 替身：逐位置报告全部（含重叠的）命中。"""
+
+    def __init__(self):
+        self.words = {}
+
+    def add_word(self, word, value):
+        self.words[word] = value
+
+    def make_automaton(self):
+        pass
+
+    def iter(self, text):
+        for end in range(len(text)):
+            for word, value in self.words.items():
+                if text.endswith(word, 0, end + 1):
+                    yield end, value
+
+
+def test_keyword_matcher_uses_aho_corasick_when_available(monkeypatch):
+    fake_module = type("FakeAhoCorasick", (), {"Automaton": _FakeAutomaton})
+    monkeypatch.setattr(mechanics, "_ahocorasick", fake_module)
+    mechanics._compile_keyword_matcher.cache_clear()
+    groups = (("dark",), ("darkness",), ("light", "sun"), ())
+    try:
+        assert mechanics._match_keyword_groups("the darkness falls", groups) == {0, 1}
+        assert mechanics._match_keyword_groups("sunrise over the dark", groups) == {0, 2}
+        assert mechanics._match_keyword_groups("nothing here", groups) == set()
+        assert mechanics._match_keyword_groups("xyz", (("",), ("dark",))) == {0}
+    finally:
+        mechanics._compile_keyword_matcher.cache_clear()
+
+
+def test_quest_stage_scan_stops_at_last_satisfied_stage_and_keeps_completion():
+    from core.systems.quest import QuestManager
+
+    quest = {"id": "q", "stages": [
+        {"id": "s0", "condition": "flags.a == True"},
+        {"id": "s1", "condition": "flags.b == True", "status": "COMPLETED"},
+        {"id": "s2", "condition": "flags.c == True"},
+        {"id": "s3", "condition": "flags.d == True"},
+    ]}
+
+    mechanics.compile_condition.cache_clear()
+    [result] = QuestManager.check_quests([quest], {"d": True})
+    assert (result["stage_id"], result["completed"]) == ("s3", False)
+    assert mechanics.compile_condition.cache_info().misses == 2  # s3 与 COMPLETED 的 s1
+
+    [result] = QuestManager.check_quests([quest], {"b": True, "c": True})
+    assert (result["stage_id"], result["status"], result["completed"]) == ("s2", "ACTIVE", True)
+    [result] = QuestManager.check_quests([quest], {"a": True, "b": True})
+    assert (result["stage_id"], result["status"], result["completed"]) == ("s1", "COMPLETED", True)
+    assert QuestManager.check_quests([quest], {}) == []
+
+
+def test_apply_item_effect_shares_the_generic_result():
+    first = mechanics.apply_item_effect("rope", {"name": "Rope", "effect": "utility:climb"})
+    second = mechanics.apply_item_effect("torch", {"effect": "light"})
+
+    assert first is second
+    assert first == {"success": True, "message": "used successfully.", "value": 0, "type": "generic"}
+    assert mechanics.apply_item_effect("rock", {"name": "Rock"})["message"] == "Rock has no usage effect."
+
+
+def test_trigger_keywords_compile_once_for_reloaded_configs():
+    def _fresh_config():
+        # 模拟每回合从 YAML 重新加载：内容相同、对象全新
+        return [
+            {"id": "a", "trigger_type": "keyword_match", "keywords": ["Artifact", "relic"]},
+            {"id": "b", "trigger_type": "keyword_match", "keywords": ["tadpole"]},
+        ]
+
+    mechanics._compile_keyword_matcher.cache_clear()
+    for message in ("the relic glows", "a tadpole!", "nothing", "ARTIFACT"):
+        mechanics.process_dialogue_triggers(message, _fresh_config(), {})
+
+    info = mechanics._compile_keyword_matcher.cache_info()
+    assert (info.misses, info.hits) == (1, 3)
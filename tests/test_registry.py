@@ -3,6 +3,8 @@ Registry 保护性测试。
 锁定 items.yaml 与 weapons.yaml 的统一加载和查询契约。
 """
 
+import pytest
+
 from core.systems.inventory import get_registry, init_registry
 
 
@@ -27,3 +29,89 @@ def test_registry_loads_items_and_weapons_from_config_directory():
     assert registry.resolve_item_id("Scale Mail") == "scale_mail"
     assert "healing_potion" in registry.all_items()
     assert "scimitar" in registry.all_items()
+
+
+def test_inventory_add_respects_stack_rules_from_single_registry_lookup():
+    from core.systems.inventory import Inventory
+
+    assert init_registry("config/items.yaml") is True
+    inventory = Inventory()
+
+    assert inventory.add("healing_potion", 3) is True
+    assert inventory.add("scimitar") is True
+    assert inventory.add("scimitar") is False
+    assert inventory.get_quantity("healing_potion") == 3
+    assert inventory.get_quantity("scimitar") == 1
+    assert get_registry().get("Scale Mail") is get_registry().get("scale_mail")
+
+
+def test_item_registry_facade_forwards_to_module_level_database():
+    from core.systems import inventory
+
+    assert init_registry("config/items.yaml") is True
+
+    assert inventory.ItemRegistry() is get_registry()
+    assert get_registry().is_loaded() is inventory.is_registry_loaded() is True
+    assert get_registry().get("healing_potion") is inventory.get_item_data("healing_potion")
+    assert inventory.get_item_name("scimitar") == get_registry().get_name("scimitar")
+    assert inventory.get_item_data("no_such_item")["type"] == "unknown"
+
+
+def test_inventory_and_registry_instances_have_no_instance_dict():
+    from core.systems.inventory import Inventory
+
+    assert not hasattr(Inventory(), "__dict__")
+    assert not hasattr(get_registry(), "__dict__")
+
+
+def test_inventory_to_dict_copies_or_returns_read_only_view():
+    from core.systems.inventory import Inventory
+
+    inventory = Inventory()
+    inventory.add("healing_potion", 2)
+
+    assert inventory.to_dict() == {"healing_potion": 2}
+    assert inventory.to_dict() is not inventory.items
+
+    view = inventory.to_dict(copy=False)
+    assert view == {"healing_potion": 2}
+    with pytest.raises(TypeError):
+        view["healing_potion"] = 99
+    inventory.add("healing_potion", 1)
+    assert view["healing_potion"] == 3
+
+
+def test_inventory_total_count_tracks_add_remove_and_reload():
+    from core.systems.inventory import Inventory
+
+    assert init_registry("config/items.yaml") is True
+    inventory = Inventory()
+    inventory.add("healing_potion", 3)
+    inventory.add("scimitar")
+    inventory.add("scimitar")
+    inventory.remove("healing_potion", 2)
+
+    assert inventory.count_total_items() == sum(inventory.items.values()) == 2
+
+    inventory.from_dict({"gold_coin": 10, "healing_potion": 1})
+    assert inventory.count_total_items() == 11
+
+    inventory.clear()
+    assert inventory.count_total_items() == 0
+
+
+def test_inventory_list_items_formats_names_and_quantities():
+    from core.systems.inventory import Inventory
+
+    assert init_registry("config/items.yaml") is True
+    inventory = Inventory()
+    assert inventory.list_items() == "Empty"
+    assert inventory.list_item_names() == []
+
+    inventory.add("healing_potion", 2)
+    inventory.add("scimitar")
+    potion = get_registry().get_name("healing_potion")
+    scimitar = get_registry().get_name("scimitar")
+
+    assert inventory.list_items() == f"{potion} x2, {scimitar}"
+    assert inventory.list_item_names() == [f"{potion} x2", scimitar]
@@ -104,3 +104,51 @@ def test_dm_failure_override():
         "办不到",
     ]
     assert any(keyword in reply for keyword in refuse_keywords), reply
+
+
+def test_core_inventory_is_pure_compat_shim():
+    """core.inventory 只做重定向：所有导出与 core.systems.inventory 为同一对象。"""
+    from core import inventory as compat_inventory
+    from core.systems import inventory as systems_inventory
+
+    for name in compat_inventory.__all__:
+        assert getattr(compat_inventory, name) is getattr(systems_inventory, name)
+
+
+def test_core_engine_exports_resolve_lazily_without_loading_llm_client():
+    """core.engine.physics 不应连带加载归档引擎（openai 客户端）；导出仍与原对象一致。"""
+    import subprocess
+    import sys
+
+    probe = (
+        "import sys, core.engine.physics, core.systems.dice; "
+        "print('archive.v1_legacy.engine' in sys.modules)"
+    )
+    loaded = subprocess.run(
+        [sys.executable, "-c", probe], capture_output=True, text=True, check=True
+    ).stdout.strip()
+    assert loaded == "False"
+
+    import core.engine as engine
+    from archive.v1_legacy import engine as legacy_engine
+
+    assert engine.generate_dialogue is legacy_engine.generate_dialogue
+    assert set(engine.__all__) == set(engine._EXPORTS)
+
+
+def test_game_state_journal_events_keeps_merge_events_reducer():
+    """GameState 只有一份定义，journal_events 仍绑定 merge_events Reducer。"""
+    from typing import get_type_hints
+
+    from core.graph.graph_state import GameState, merge_events
+
+    hint = get_type_hints(GameState, include_extras=True)["journal_events"]
+
+    assert merge_events in hint.__metadata__
+    assert merge_events(["a"], ["b", "c"]) == ["a", "b", "c"]
+    assert merge_events(None, ["b"]) == ["b"]
+
+    left = ["a"]
+    assert merge_events(left, []) is left
+    merged = merge_events(left, ["b"])
+    assert merged == ["a", "b"] and left == ["a"]
@@ -173,6 +173,19 @@ def test_build_visible_history_normalizes_to_visible_message():
     assert visible_history[1].content == "离远点。"
 
 
+def test_build_visible_history_keeps_only_recent_window_for_long_sessions():
+    messages = []
+    for index in range(50):
+        messages.append({"role": "user", "content": f"玩家第{index}句"})
+        messages.append({"role": "assistant", "content": f"回应第{index}句"})
+
+    visible_history = build_visible_history(messages, actor_id="shadowheart", limit=12)
+
+    assert len(visible_history) == 12
+    assert visible_history[0].content == "玩家第44句"
+    assert visible_history[-1].content == "回应第49句"
+
+
 def test_build_recent_public_events_returns_tail_slice():
     events = [f"event-{idx}" for idx in range(1, 11)]
     assert build_recent_public_events(events, limit=4) == [